@@ -0,0 +1,24 @@
+import time
+
+from django.core.management import BaseCommand
+
+from analytics.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    """
+    Command that recomputes the question statistics from the graded attempts, to recover
+    from drift in the incrementally maintained counters.
+
+    You can call it by terminal like this:
+    -> "python manage.py rebuild_question_statistics --question 1 2"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--question', dest='question_ids', nargs='+', type=int, help='Only rebuild these questions.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rebuilt = rebuild_statistics(options['question_ids'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics of {rebuilt} questions in {elapsed:.2f}s.'))
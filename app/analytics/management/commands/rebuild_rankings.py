@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from analytics.ranking import rebuild_histogram
+from exam.models import Exam
+
+
+class Command(BaseCommand):
+    """
+    Command that rebuilds the score histograms used for rankings from the graded attempts.
+
+    You can call it by terminal like this:
+    -> "python manage.py rebuild_rankings 1 2" or "python manage.py rebuild_rankings" for every exam
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('exam_ids', nargs='*', type=int)
+
+    def handle(self, *args, **options):
+        exam_ids = options['exam_ids'] or Exam.objects.values_list('pk', flat=True)
+        for exam_id in exam_ids:
+            rebuild_histogram(exam_id)
+            self.stdout.write(f'Rebuilt ranking of exam {exam_id}.')
+        self.stdout.write(self.style.SUCCESS('Rankings rebuilt.'))
@@ -0,0 +1,80 @@
+import math
+
+from django.db import models
+
+from exam.models import Exam
+from question.models import Question
+from question.utils import AlternativesChoices
+
+
+def option_field(option):
+    return f'option_{AlternativesChoices(option).label.lower()}'
+
+
+class QuestionStatistics(models.Model):
+    """
+    Running counters and sums of the graded responses to a question, kept up to date
+    as attempts are graded so item statistics never need a scan of the answers.
+    """
+    question = models.OneToOneField(Question, primary_key=True, related_name='statistics', on_delete=models.CASCADE)
+    responses = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    unanswered = models.PositiveIntegerField(default=0)
+    option_a = models.PositiveIntegerField(default=0)
+    option_b = models.PositiveIntegerField(default=0)
+    option_c = models.PositiveIntegerField(default=0)
+    option_d = models.PositiveIntegerField(default=0)
+    option_e = models.PositiveIntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0)
+    score_squares_sum = models.BigIntegerField(default=0)
+    correct_score_sum = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'question statistics'
+
+    def __str__(self):
+        return f'{self.question_id} statistics'
+
+    @property
+    def percent_correct(self):
+        if not self.responses:
+            return None
+        return 100 * self.correct / self.responses
+
+    @property
+    def distribution(self):
+        return {choice.label: getattr(self, option_field(choice)) for choice in AlternativesChoices}
+
+    @property
+    def point_biserial(self):
+        """
+        Correlation between answering this question correctly and the exam score.
+        """
+        n, k = self.responses, self.correct
+        if not n or k in (0, n):
+            return None
+        mean = self.score_sum / n
+        variance = self.score_squares_sum / n - mean ** 2
+        if variance <= 0:
+            return None
+        correct_mean = self.correct_score_sum / k
+        incorrect_mean = (self.score_sum - self.correct_score_sum) / (n - k)
+        p = k / n
+        return (correct_mean - incorrect_mean) / math.sqrt(variance) * math.sqrt(p * (1 - p))
+
+
+class ExamScoreBucket(models.Model):
+    """
+    How many graded attempts of an exam got each score. An exam has at most one bucket
+    per possible score, so ranks and percentiles are read from a handful of rows.
+    """
+    exam = models.ForeignKey(Exam, related_name='score_buckets', on_delete=models.CASCADE)
+    score = models.PositiveIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('exam', 'score')
+
+    def __str__(self):
+        return f'{self.exam} - {self.score}: {self.count}'
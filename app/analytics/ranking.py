@@ -0,0 +1,125 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F
+
+from analytics.models import ExamScoreBucket
+from attempt.models import Attempt
+from utils.cache import bump_versions, get_version
+from utils.routers import use_primary
+
+
+def get_cache():
+    return caches[settings.EXAM_CACHE_ALIAS]
+
+
+def version_name(exam_id):
+    return f'histogram:{exam_id}'
+
+
+def histogram_key(exam_id, version):
+    return f'exam-histogram:{exam_id}:{version}'
+
+
+def invalidate_histogram(exam_id):
+    name = version_name(exam_id)
+    transaction.on_commit(lambda: bump_versions(get_cache(), [name]))
+
+
+# Histograms are cached until the next grading, so they are never loaded from a lagging replica.
+# Like exam payloads, they are stored under a version bumped by each grading.
+@use_primary()
+def load_histogram(exam_id):
+    return list(
+        ExamScoreBucket.objects
+        .filter(exam_id=exam_id, count__gt=0)
+        .order_by('-score')
+        .values_list('score', 'count')
+    )
+
+
+def get_histogram(exam_id):
+    """
+    Returns the (score, count) buckets of an exam from the highest score to the lowest.
+    """
+    key = histogram_key(exam_id, get_version(get_cache(), version_name(exam_id)))
+    histogram = get_cache().get(key)
+    if histogram is None:
+        histogram = load_histogram(exam_id)
+        get_cache().set(key, histogram)
+    return histogram
+
+
+def position(exam_id, score):
+    """
+    Rank of a score (ties share the best rank) and its percentile: the share of graded
+    attempts below it, counting ties as half.
+    """
+    histogram = get_histogram(exam_id)
+    total = sum(count for _, count in histogram)
+    above = sum(count for bucket_score, count in histogram if bucket_score > score)
+    equal = sum(count for bucket_score, count in histogram if bucket_score == score)
+    below = total - above - equal
+    return {
+        'score': score,
+        'position': above + 1,
+        'percentile': 100 * (below + equal / 2) / total if total else None,
+        'total': total,
+    }
+
+
+def top(exam_id, limit):
+    attempts = (
+        Attempt.objects
+        .filter(exam_id=exam_id, graded_at__isnull=False)
+        .order_by('-score', 'graded_at', 'id')
+        .values('student_id', 'score', name=F('student__name'))[:limit]
+    )
+    histogram = get_histogram(exam_id)
+    ranks = {}
+    above = 0
+    for score, count in histogram:
+        ranks[score] = above + 1
+        above += count
+    return [{**attempt, 'position': ranks.get(attempt['score'])} for attempt in attempts]
+
+
+def add_graded(result):
+    """
+    Moves each graded attempt from the bucket of its previous score, if it had one,
+    to the bucket of its new score.
+    """
+    deltas = {}
+    scores, counts = np.unique(result.totals, return_counts=True)
+    for score, count in zip(scores.tolist(), counts.tolist()):
+        deltas[score] = deltas.get(score, 0) + count
+    previous = result.previous_totals[result.previously_graded]
+    scores, counts = np.unique(previous, return_counts=True)
+    for score, count in zip(scores.tolist(), counts.tolist()):
+        deltas[score] = deltas.get(score, 0) - count
+
+    deltas = {score: delta for score, delta in deltas.items() if delta}
+    ExamScoreBucket.objects.bulk_create(
+        [ExamScoreBucket(exam_id=result.exam_id, score=score) for score in deltas],
+        ignore_conflicts=True,
+    )
+    for score, delta in deltas.items():
+        ExamScoreBucket.objects.filter(exam_id=result.exam_id, score=score).update(count=F('count') + delta)
+    invalidate_histogram(result.exam_id)
+
+
+def rebuild_histogram(exam_id):
+    buckets = (
+        Attempt.objects
+        .filter(exam_id=exam_id, graded_at__isnull=False)
+        .values('score')
+        .annotate(count=Count('id'))
+    )
+    with transaction.atomic():
+        ExamScoreBucket.objects.filter(exam_id=exam_id).delete()
+        ExamScoreBucket.objects.bulk_create([
+            ExamScoreBucket(exam_id=exam_id, score=bucket['score'], count=bucket['count'])
+            for bucket in buckets
+        ])
+    invalidate_histogram(exam_id)
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from analytics.models import QuestionStatistics
+
+
+class QuestionStatisticsSerializer(serializers.ModelSerializer):
+    percent_correct = serializers.FloatField(read_only=True)
+    distribution = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    point_biserial = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = QuestionStatistics
+        fields = (
+            'question', 'responses', 'correct', 'unanswered', 'percent_correct',
+            'distribution', 'point_biserial', 'updated_at',
+        )
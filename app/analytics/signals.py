@@ -0,0 +1,23 @@
+from django.dispatch import receiver
+
+from analytics import ranking
+from analytics.statistics import add_graded, exam_question_ids, rebuild_statistics
+from attempt.signals import attempts_graded
+
+
+@receiver(attempts_graded)
+def update_question_statistics(sender, result, **kwargs):
+    # Regraded attempts were already counted with their old answers, which are gone, so
+    # the exam's questions are recomputed instead of incremented. grade_submissions only
+    # regrades attempts that were resubmitted after being graded.
+    if not len(result.attempt_ids):
+        return
+    if result.previously_graded.any():
+        rebuild_statistics(list(exam_question_ids(result.exam_id).values()))
+    else:
+        add_graded(result)
+
+
+@receiver(attempts_graded)
+def update_score_histogram(sender, result, **kwargs):
+    ranking.add_graded(result)
@@ -0,0 +1,115 @@
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from analytics.models import QuestionStatistics, option_field
+from attempt.models import Attempt, Answer
+from exam.models import ExamQuestion
+from question.utils import AlternativesChoices
+
+COUNTER_FIELDS = (
+    'responses', 'correct', 'unanswered', 'score_sum', 'score_squares_sum', 'correct_score_sum',
+    *(option_field(choice) for choice in AlternativesChoices),
+)
+
+
+def exam_question_ids(exam_id):
+    return dict(ExamQuestion.objects.filter(exam_id=exam_id).values_list('number', 'question_id'))
+
+
+def add_graded(result):
+    """
+    Adds the responses of freshly graded attempts to the running counters of each question.
+    """
+    sheets = result.sheets
+    correct = result.correct
+    totals = result.totals.astype(np.int64)
+
+    deltas = {}
+    score_sum = int(totals.sum())
+    score_squares_sum = int((totals ** 2).sum())
+    for number, question_id in exam_question_ids(result.exam_id).items():
+        column = number - 1
+        options = np.bincount(sheets[:, column], minlength=len(AlternativesChoices) + 1)
+        deltas[question_id] = {
+            'responses': len(totals),
+            'correct': int(correct[:, column].sum()),
+            'unanswered': int(options[0]),
+            'score_sum': score_sum,
+            'score_squares_sum': score_squares_sum,
+            'correct_score_sum': int(totals[correct[:, column]].sum()),
+            **{option_field(choice): int(options[choice]) for choice in AlternativesChoices},
+        }
+
+    QuestionStatistics.objects.bulk_create(
+        [QuestionStatistics(question_id=question_id) for question_id in deltas],
+        ignore_conflicts=True,
+    )
+    for question_id, delta in deltas.items():
+        QuestionStatistics.objects.filter(pk=question_id).update(
+            **{field: F(field) + value for field, value in delta.items()}
+        )
+
+
+def rebuild_statistics(question_ids=None):
+    """
+    Recomputes the counters of the given questions, or of every question, from the graded
+    attempts. Aggregation happens in the database, grouped by exam and by question/option.
+    """
+    exam_questions = ExamQuestion.objects.all()
+    answers = Answer.objects.filter(attempt__graded_at__isnull=False)
+    if question_ids is not None:
+        exam_questions = exam_questions.filter(question_id__in=question_ids)
+        # Filtering on the partition key keeps Postgres to the partitions of those exams.
+        answers = answers.filter(
+            exam_id__in=exam_questions.values('exam_id'), exam_question__question_id__in=question_ids,
+        )
+
+    exam_totals = {
+        row['exam_id']: row
+        for row in Attempt.objects
+        .filter(graded_at__isnull=False, exam_id__in=exam_questions.values('exam_id'))
+        .values('exam_id')
+        .annotate(
+            responses=Count('id'),
+            score_sum=Sum('score'),
+            score_squares_sum=Sum(F('score') * F('score')),
+        )
+    }
+
+    counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    for exam_id, question_id in exam_questions.values_list('exam_id', 'question_id').iterator(chunk_size=10000):
+        totals = exam_totals.get(exam_id)
+        if totals is None:
+            continue
+        stats = counters[question_id]
+        stats['responses'] += totals['responses']
+        stats['unanswered'] += totals['responses']
+        stats['score_sum'] += totals['score_sum'] or 0
+        stats['score_squares_sum'] += totals['score_squares_sum'] or 0
+
+    grouped = (
+        answers
+        .values('exam_question__question_id', 'alternative__option', 'alternative__is_correct')
+        .annotate(count=Count('id'), score_sum=Sum('attempt__score'))
+    )
+    for row in grouped:
+        stats = counters[row['exam_question__question_id']]
+        stats[option_field(row['alternative__option'])] += row['count']
+        stats['unanswered'] -= row['count']
+        if row['alternative__is_correct']:
+            stats['correct'] += row['count']
+            stats['correct_score_sum'] += row['score_sum'] or 0
+
+    with transaction.atomic():
+        stale = QuestionStatistics.objects.all()
+        if question_ids is not None:
+            stale = stale.filter(pk__in=question_ids)
+        stale.delete()
+        QuestionStatistics.objects.bulk_create(
+            [QuestionStatistics(question_id=question_id, **stats) for question_id, stats in counters.items()],
+            batch_size=1000,
+        )
+    return len(counters)
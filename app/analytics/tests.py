@@ -0,0 +1,109 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.utils import timezone
+
+from analytics import ranking
+from analytics.models import QuestionStatistics
+from analytics.statistics import COUNTER_FIELDS, rebuild_statistics
+from attempt.grading import grade_submissions
+from attempt.models import Attempt, Answer
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from question.utils import AlternativesChoices
+from student.models import Student
+from utils.cache import get_version
+
+
+class GradedExamTestCase(TestCase):
+    def setUp(self):
+        self.exam = Exam.objects.create(name='Clínica médica')
+        self.exam_questions = []
+        for number, correct in enumerate([AlternativesChoices.A, AlternativesChoices.C, AlternativesChoices.E], start=1):
+            question = Question.objects.create(content=f'Questão {number}')
+            for choice in AlternativesChoices:
+                Alternative.objects.create(question=question, content=choice.label, option=choice, is_correct=choice == correct)
+            self.exam_questions.append(ExamQuestion.objects.create(exam=self.exam, question=question, number=number))
+        self.students = 0
+
+    def submit(self, options):
+        self.students += 1
+        student = Student.objects.create(username=f'aluno{self.students}', email=f'aluno{self.students}@medway.com')
+        attempt = Attempt.objects.create(student=student, exam=self.exam, submitted_at=timezone.now())
+        self.answer(attempt, options)
+        return attempt
+
+    def answer(self, attempt, options):
+        for exam_question, option in zip(self.exam_questions, options):
+            if option is not None:
+                alternative = exam_question.question.alternatives.get(option=option)
+                Answer.objects.update_or_create(
+                    attempt=attempt, exam=self.exam, exam_question=exam_question,
+                    defaults={'alternative': alternative},
+                )
+
+
+class IncrementalStatisticsTests(GradedExamTestCase):
+    def counters(self):
+        return {
+            statistics.pk: {field: getattr(statistics, field) for field in COUNTER_FIELDS}
+            for statistics in QuestionStatistics.objects.all()
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.counters()
+        rebuild_statistics()
+        self.assertEqual(incremental, self.counters())
+
+    def test_incremental_counters_match_rebuild(self):
+        self.submit([1, 3, 5])
+        self.submit([2, 3, None])
+        grade_submissions(self.exam.pk)
+        self.assertMatchesRebuild()
+
+        self.submit([1, 1, 5])
+        self.submit([None, None, None])
+        self.submit([1, 3, 4])
+        self.assertEqual(len(grade_submissions(self.exam.pk).attempt_ids), 3)
+        self.assertMatchesRebuild()
+
+    def test_resubmission_is_regraded(self):
+        attempt = self.submit([2, 2, 2])
+        grade_submissions(self.exam.pk)
+
+        self.answer(attempt, [1, 3, 5])
+        Attempt.objects.filter(pk=attempt.pk).update(submitted_at=timezone.now())
+        result = grade_submissions(self.exam.pk)
+
+        self.assertEqual(result.totals.tolist(), [3])
+        self.assertEqual(self.counters()[self.exam_questions[0].question_id]['correct'], 1)
+        self.assertMatchesRebuild()
+
+
+
+class RankingTests(GradedExamTestCase):
+    def setUp(self):
+        super().setUp()
+        ranking.get_cache().clear()
+
+    def test_leaderboard_limit_is_at_least_one(self):
+        self.submit([1, 3, 5])
+        self.submit([1, 1, 1])
+        grade_submissions(self.exam.pk)
+        client = APIClient()
+        client.force_authenticate(Student.objects.get(username='aluno1'))
+
+        response = client.get(f'/api/exams/{self.exam.pk}/leaderboard/', {'limit': -1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['score'] for row in response.json()], [3])
+
+    def test_histogram_loaded_before_a_grading_is_not_served_after_it(self):
+        version = get_version(ranking.get_cache(), ranking.version_name(self.exam.pk))
+        stale = ranking.load_histogram(self.exam.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.submit([1, 3, 5])
+            grade_submissions(self.exam.pk)
+        ranking.get_cache().set(ranking.histogram_key(self.exam.pk, version), stale)
+
+        self.assertEqual(ranking.get_histogram(self.exam.pk), [(3, 1)])
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from analytics.views import QuestionStatisticsView, ExamRankingView, LeaderboardView
+
+urlpatterns = [
+    path('questions/<int:pk>/statistics/', QuestionStatisticsView.as_view(), name='question-statistics'),
+    path('exams/<int:pk>/ranking/', ExamRankingView.as_view(), name='exam-ranking'),
+    path('exams/<int:pk>/leaderboard/', LeaderboardView.as_view(), name='exam-leaderboard'),
+]
@@ -0,0 +1,44 @@
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from analytics import ranking
+from analytics.models import QuestionStatistics
+from analytics.serializers import QuestionStatisticsSerializer
+from attempt.models import Attempt
+
+
+class QuestionStatisticsView(generics.RetrieveAPIView):
+    queryset = QuestionStatistics.objects.all()
+    serializer_class = QuestionStatisticsSerializer
+    permission_classes = [IsAdminUser]
+
+
+class ExamRankingView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        score = (
+            Attempt.objects
+            .filter(exam_id=pk, student=request.user, graded_at__isnull=False)
+            .values_list('score', flat=True)
+            .first()
+        )
+        if score is None:
+            raise Http404
+        return Response(ranking.position(pk, score))
+
+
+class LeaderboardView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 100
+
+    def get(self, request, pk):
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        return Response(ranking.top(pk, limit))
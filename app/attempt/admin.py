@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from attempt.models import Attempt, Answer
+
+
+class AnswerInline(admin.TabularInline):
+    model = Answer
+    raw_id_fields = ('exam_question', 'alternative')
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('exam_question__question', 'alternative')
+
+
+@admin.register(Attempt)
+class AttemptAdmin(admin.ModelAdmin):
+    inlines = [AnswerInline]
+    raw_id_fields = ('student', 'exam')
+    list_display = ('student', 'exam', 'score', 'submitted_at', 'graded_at')
+    list_select_related = ('student', 'exam')
+    list_filter = ('exam',)
+    list_per_page = 50
+    show_full_result_count = False
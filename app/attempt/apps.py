@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AttemptConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'attempt'
+
+    def ready(self):
+        import attempt.signals  # noqa: F401
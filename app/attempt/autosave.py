@@ -0,0 +1,257 @@
+"""
+Write-coalescing autosave for attempts in progress.
+
+Each click stores its answers in the "autosave" cache instead of the database, one key per
+question, so concurrent clicks of the same attempt never overwrite each other's questions.
+The buffered answers are written to the answer tables, with batched upserts, when the
+attempt's last write is older than AUTOSAVE_FLUSH_INTERVAL seconds, when the exam is
+submitted, or when pending answers are flushed: every AUTOSAVE_FLUSH_INTERVAL seconds by the
+"flush_autosaves" job that run_jobs schedules, or on demand with "manage.py flush_autosaves".
+
+Changed answers are kept in a log of numbered cache keys: the first click on a question
+since the last flush appends it with an atomic incr, so clicks never wait on each other.
+The job and the command read the answers from the cache, so they only see those of other
+processes with a shared cache (REDIS_URL or AUTOSAVE_CACHE_BACKEND); with a local-memory
+cache they flush nothing written by the web processes.
+
+Once an attempt is submitted its autosaves are refused, and answers still buffered for it
+are never written over the submitted ones.
+
+Crash recovery: with a shared cache, the database is at most AUTOSAVE_FLUSH_INTERVAL
+seconds, plus the time the flush job takes, behind what the student clicked, and buffers
+survive web restarts as long as the cache keeps them (AUTOSAVE_BUFFER_TTL). With a
+local-memory cache, buffers of a web process that dies are lost, so every click since the
+attempt's last inline write is lost. Clients should always send the full sheet on final
+submission, which is authoritative.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from attempt.models import Attempt, Answer
+from exam import snapshot
+
+PENDING_COUNT_KEY = 'autosave:pending-count'
+PENDING_CURSOR_KEY = 'autosave:pending-cursor'
+FLUSH_BATCH_SIZE = 1000
+
+
+class AttemptSubmitted(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This attempt was already submitted.'
+    default_code = 'attempt_submitted'
+
+
+def get_cache():
+    return caches[settings.AUTOSAVE_CACHE_ALIAS]
+
+
+def answer_key(student_id, exam_id, exam_question_id):
+    return f'autosave:{student_id}:{exam_id}:{exam_question_id}'
+
+
+def flushed_key(student_id, exam_id):
+    return f'autosave:flushed:{student_id}:{exam_id}'
+
+
+def submitted_key(student_id, exam_id):
+    return f'autosave:submitted:{student_id}:{exam_id}'
+
+
+def pending_key(index):
+    return f'autosave:pending:{index}'
+
+
+def marked_key(student_id, exam_id, exam_question_id):
+    return f'autosave:marked:{student_id}:{exam_id}:{exam_question_id}'
+
+
+def exam_question_ids(payload):
+    return [exam_question['id'] for exam_question in payload['questions']] if payload else []
+
+
+def mark_pending(student_id, exam_id, exam_question_id):
+    """
+    Appends an answer to the pending log, unless it was appended since the last flush.
+    The mark expires after one flush interval, so an answer whose log entry was lost
+    (evicted, or read by a flush before it was written) is appended again by its next click.
+    """
+    cache = get_cache()
+    if not cache.add(marked_key(student_id, exam_id, exam_question_id), 1, timeout=settings.AUTOSAVE_FLUSH_INTERVAL):
+        return
+    cache.add(PENDING_COUNT_KEY, 0, timeout=None)
+    try:
+        index = cache.incr(PENDING_COUNT_KEY)
+    except ValueError:
+        # The counter was evicted between add and incr.
+        cache.add(PENDING_COUNT_KEY, 0, timeout=None)
+        index = cache.incr(PENDING_COUNT_KEY)
+    cache.set(pending_key(index), (student_id, exam_id, exam_question_id), timeout=settings.AUTOSAVE_BUFFER_TTL)
+
+
+def buffer_answers(student_id, exam_id, resolved):
+    """
+    Buffers resolved (exam_question_id, alternative_id) answers of an attempt and returns
+    whether the buffered answers were flushed to the database. Raises AttemptSubmitted once
+    the attempt was submitted.
+    """
+    cache = get_cache()
+    if cache.get(submitted_key(student_id, exam_id)):
+        raise AttemptSubmitted()
+    resolved = dict(resolved)
+    cache.set_many(
+        {answer_key(student_id, exam_id, exam_question_id): alternative_id for exam_question_id, alternative_id in resolved.items()},
+        timeout=settings.AUTOSAVE_BUFFER_TTL,
+    )
+
+    cache.add(flushed_key(student_id, exam_id), time.time(), timeout=settings.AUTOSAVE_BUFFER_TTL)
+    flushed_at = cache.get(flushed_key(student_id, exam_id), 0)
+    flush = time.time() - flushed_at >= settings.AUTOSAVE_FLUSH_INTERVAL
+    if flush:
+        cache.set(flushed_key(student_id, exam_id), time.time(), timeout=settings.AUTOSAVE_BUFFER_TTL)
+        write_buffers([(student_id, exam_id, buffered_answers(student_id, [exam_id])[exam_id])])
+    else:
+        for exam_question_id in resolved:
+            mark_pending(student_id, exam_id, exam_question_id)
+    return flush
+
+
+def buffer_keys(student_id, payloads):
+    return {
+        answer_key(student_id, exam_id, exam_question_id): (exam_id, exam_question_id)
+        for exam_id, payload in payloads.items()
+        for exam_question_id in exam_question_ids(payload)
+    }
+
+
+def group_answers(keys, values, exam_ids):
+    answers = {exam_id: {} for exam_id in exam_ids}
+    for key, alternative_id in values.items():
+        exam_id, exam_question_id = keys[key]
+        answers[exam_id][exam_question_id] = alternative_id
+    return answers
+
+
+def buffered_answers(student_id, exam_ids):
+    """
+    Returns the buffered {exam_question_id: alternative_id} answers of each exam, for a
+    final submission to merge under the submitted sheet.
+    """
+    keys = buffer_keys(student_id, {exam_id: snapshot.get_exam_payload(exam_id) for exam_id in exam_ids})
+    return group_answers(keys, get_cache().get_many(list(keys)), exam_ids)
+
+
+async def abuffered_answers(student_id, exam_ids):
+    keys = buffer_keys(student_id, {exam_id: await snapshot.aget_exam_payload(exam_id) for exam_id in exam_ids})
+    return group_answers(keys, await get_cache().aget_many(list(keys)), exam_ids)
+
+
+def closed_buffers(student_id, exam_ids, answers):
+    """
+    Marks submitted attempts, so their later autosaves are refused, and lists the keys of
+    their buffered answers.
+    """
+    submitted = {submitted_key(student_id, exam_id): 1 for exam_id in exam_ids}
+    keys = [
+        answer_key(student_id, exam_id, exam_question_id)
+        for exam_id in exam_ids
+        for exam_question_id in answers.get(exam_id, {})
+    ]
+    return submitted, keys
+
+
+def clear_buffers(student_id, exam_ids, answers):
+    submitted, keys = closed_buffers(student_id, exam_ids, answers)
+
+    def clear():
+        get_cache().set_many(submitted, timeout=settings.AUTOSAVE_BUFFER_TTL)
+        get_cache().delete_many(keys)
+
+    transaction.on_commit(clear)
+
+
+async def aclear_buffers(student_id, exam_ids, answers):
+    submitted, keys = closed_buffers(student_id, exam_ids, answers)
+    await get_cache().aset_many(submitted, timeout=settings.AUTOSAVE_BUFFER_TTL)
+    await get_cache().adelete_many(keys)
+
+
+def write_buffers(entries):
+    """
+    Upserts the attempts and answers of (student_id, exam_id, answers) entries with one
+    statement per table. Entries of submitted attempts are skipped: their rows stay locked
+    until the upsert commits, so a submission running meanwhile waits and writes its
+    answers over these.
+    """
+    entries = [entry for entry in entries if entry[2]]
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        existing = (
+            Attempt.objects
+            .filter(Q(*[Q(student_id=student_id, exam_id=exam_id) for student_id, exam_id, _ in entries], _connector=Q.OR))
+            .order_by('pk')
+            .select_for_update()
+            .values_list('student_id', 'exam_id', 'submitted_at')
+        )
+        submitted = {(student_id, exam_id) for student_id, exam_id, submitted_at in existing if submitted_at}
+        entries = [entry for entry in entries if entry[:2] not in submitted]
+        if not entries:
+            return 0
+        attempts = Attempt.objects.bulk_create(
+            [Attempt(student_id=student_id, exam_id=exam_id) for student_id, exam_id, _ in entries],
+            update_conflicts=True,
+            unique_fields=['student', 'exam'],
+            # An upsert needs something to update to return the id; the exam never changes.
+            update_fields=['exam'],
+        )
+        Answer.objects.bulk_create(
+            [
+                Answer(attempt=attempt, exam_id=attempt.exam_id, exam_question_id=exam_question_id, alternative_id=alternative_id)
+                for attempt, (_, _, answers) in zip(attempts, entries)
+                for exam_question_id, alternative_id in answers.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['exam', 'attempt', 'exam_question'],
+            update_fields=['alternative'],
+        )
+    return len(entries)
+
+
+def flush_pending():
+    """
+    Writes every answer changed since the last flush, FLUSH_BATCH_SIZE log entries at a
+    time. Returns how many attempts were written.
+    """
+    cache = get_cache()
+    last = cache.get(PENDING_COUNT_KEY, 0)
+    cursor = cache.get(PENDING_CURSOR_KEY, 0)
+    if cursor > last:
+        # The counter was evicted and started over.
+        cursor = 0
+    cache.set(PENDING_CURSOR_KEY, last, timeout=None)
+
+    flushed = 0
+    for start in range(cursor + 1, last + 1, FLUSH_BATCH_SIZE):
+        keys = [pending_key(index) for index in range(start, min(start + FLUSH_BATCH_SIZE, last + 1))]
+        pending = set(cache.get_many(keys).values())
+        cache.delete_many(keys)
+        # Unmarked before the answers are read: a click after this point marks the answer
+        # again, and one before it is already in the value read below.
+        cache.delete_many([marked_key(*entry) for entry in pending])
+
+        values = cache.get_many([answer_key(*entry) for entry in pending])
+        by_attempt = defaultdict(dict)
+        for student_id, exam_id, exam_question_id in pending:
+            alternative_id = values.get(answer_key(student_id, exam_id, exam_question_id))
+            if alternative_id is not None:
+                by_attempt[(student_id, exam_id)][exam_question_id] = alternative_id
+        flushed += write_buffers([(student_id, exam_id, answers) for (student_id, exam_id), answers in by_attempt.items()])
+    return flushed
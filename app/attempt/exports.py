@@ -0,0 +1,27 @@
+from attempt.models import Attempt
+from utils.routers import replica_alias
+from utils.streaming import EXPORT_CHUNK_SIZE
+
+RESULT_FIELDS = (
+    'attempt_id', 'exam_id', 'exam_name', 'student_id', 'student_email',
+    'score', 'submitted_at', 'graded_at',
+)
+
+
+def result_rows(exam_id=None):
+    """
+    One row per attempt with its score, read through a server-side cursor on a replica
+    when there is one: reports can lag behind the latest submissions.
+    """
+    attempts = Attempt.objects.using(replica_alias())
+    if exam_id is not None:
+        attempts = attempts.filter(exam_id=exam_id)
+    return (
+        attempts
+        .order_by('exam_id', 'id')
+        .values_list(
+            'id', 'exam_id', 'exam__name', 'student_id', 'student__email',
+            'score', 'submitted_at', 'graded_at',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
@@ -0,0 +1,153 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from attempt.models import Attempt, Answer
+from attempt.partitions import check_answers_attached
+from attempt.signals import attempts_graded
+from exam.models import ExamQuestion
+from utils.routers import use_primary
+
+UNANSWERED = 0
+
+
+@dataclass
+class GradingResult:
+    exam_id: int
+    attempt_ids: np.ndarray
+    sheets: np.ndarray
+    correct: np.ndarray
+    totals: np.ndarray
+    previously_graded: np.ndarray
+    previous_totals: np.ndarray
+
+    def question_correctness(self, number):
+        return self.correct[:, number - 1]
+
+
+def compile_answer_key(exam_id):
+    """
+    Returns an array where position number - 1 holds the correct AlternativesChoices
+    value of the ExamQuestion with that number, or UNANSWERED when it has no key.
+    """
+    numbers = ExamQuestion.objects.filter(exam_id=exam_id).values_list('number', flat=True)
+    size = max(numbers, default=0)
+    key = np.full(size, UNANSWERED, dtype=np.int8)
+
+    correct = (
+        ExamQuestion.objects
+        .filter(exam_id=exam_id, question__alternatives__is_correct=True)
+        .values_list('number', 'question__alternatives__option')
+    )
+    for number, option in correct:
+        key[number - 1] = option
+    return key
+
+
+def score_sheets(key, sheets):
+    """
+    Scores a matrix of answer sheets, one row per student and one column per question
+    number, against an answer key in a single vectorized comparison.
+    """
+    correct = (sheets == key) & (key != UNANSWERED)
+    return correct, correct.sum(axis=1)
+
+
+def load_sheets(exam_id, size, attempt_ids):
+    sheets = np.full((len(attempt_ids), size), UNANSWERED, dtype=np.int8)
+    if not len(attempt_ids) or not size:
+        return sheets
+
+    rows = np.array(
+        list(
+            Answer.objects
+            .filter(exam_id=exam_id, attempt_id__in=attempt_ids.tolist())
+            .values_list('attempt_id', 'exam_question__number', 'alternative__option')
+            .iterator(chunk_size=10000)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    sheets[np.searchsorted(attempt_ids, rows[:, 0]), rows[:, 1] - 1] = rows[:, 2]
+    return sheets
+
+
+class GradingConflict(Exception):
+    pass
+
+
+def store_scores(rows, graded):
+    """
+    Saves the new scores of attempts, each one only if it is still graded as it was when
+    it was read, and raises GradingConflict otherwise.
+    """
+    by_previous = defaultdict(list)
+    for (_, previous_graded_at, _), attempt in zip(rows, graded):
+        by_previous[previous_graded_at].append(attempt)
+
+    updated = 0
+    for previous_graded_at, attempts in by_previous.items():
+        if previous_graded_at is None:
+            unchanged = Attempt.objects.filter(graded_at__isnull=True)
+        else:
+            unchanged = Attempt.objects.filter(graded_at=previous_graded_at)
+        updated += unchanged.bulk_update(attempts, ['score', 'graded_at'], batch_size=1000)
+    if updated != len(graded):
+        raise GradingConflict(f'{len(graded) - updated} attempts were graded by someone else meanwhile.')
+
+
+@use_primary()
+def grade_exam(exam_id, pending_only=False):
+    """
+    Grades every submitted attempt of an exam, or only those submitted since they were last
+    graded, and stores their scores. The answer key is read from the primary, so fixes to it
+    are graded right away. Attempts still in progress (only autosaved) are left out.
+    """
+    check_answers_attached(exam_id)
+    attempts = Attempt.objects.filter(exam_id=exam_id, submitted_at__isnull=False)
+    if pending_only:
+        attempts = attempts.filter(Q(graded_at__isnull=True) | Q(submitted_at__gt=F('graded_at')))
+
+    with transaction.atomic():
+        # The attempts stay locked until their scores and statistics commit, so a
+        # concurrent grading waits and then sees them graded instead of counting them again.
+        rows = list(attempts.order_by('pk').select_for_update().values_list('pk', 'graded_at', 'score'))
+        # Taken before the sheets are read: an answer saved while they are read belongs to
+        # a submission newer than graded_at, which gets graded again.
+        graded_at = timezone.now()
+        attempt_ids = np.array([attempt_id for attempt_id, _, _ in rows], dtype=np.int64)
+        previously_graded = np.array([previous is not None for _, previous, _ in rows], dtype=bool)
+        previous_totals = np.array([score or 0 for _, _, score in rows], dtype=np.int64)
+
+        key = compile_answer_key(exam_id)
+        sheets = load_sheets(exam_id, len(key), attempt_ids)
+        correct, totals = score_sheets(key, sheets)
+
+        graded = [
+            Attempt(pk=attempt_id, score=score, graded_at=graded_at)
+            for attempt_id, score in zip(attempt_ids.tolist(), totals.tolist())
+        ]
+        result = GradingResult(
+            exam_id=exam_id,
+            attempt_ids=attempt_ids,
+            sheets=sheets,
+            correct=correct,
+            totals=totals,
+            previously_graded=previously_graded,
+            previous_totals=previous_totals,
+        )
+        store_scores(rows, graded)
+        attempts_graded.send(sender=Attempt, result=result)
+
+    return result
+
+
+def grade_submissions(exam_id):
+    """
+    Grades only the attempts of an exam submitted since they were last graded, so the
+    statistics of new submissions are added to the counters instead of recomputed.
+    """
+    return grade_exam(exam_id, pending_only=True)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from attempt.models import Attempt
+from attempt.partitions import (
+    ARCHIVE_SCHEMA, archive_answer_partition, attached_partitions, is_partitioned, partition_name,
+    restore_answer_partition,
+)
+from exam.models import Exam
+
+
+class Command(BaseCommand):
+    """
+    Command that detaches the answer partitions of finished exams and moves them to the
+    "answer_archive" schema, or drops them with --drop. Scores stay on the attempts, but the
+    archived answers are no longer seen by grading and statistics: restore an exam with
+    --restore before regrading it. Postgres only.
+
+    You can call it by terminal like this:
+    -> "python manage.py archive_answer_partitions --older-than 365"
+    -> "python manage.py archive_answer_partitions --exam 1 2 --drop"
+    -> "python manage.py archive_answer_partitions --exam 1 --restore"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', dest='exam_ids', nargs='+', type=int, help='Exams to archive.')
+        parser.add_argument('--older-than', type=int, help='Archive exams without submissions for this many days.')
+        parser.add_argument('--drop', action='store_true', help='Drop the partitions instead of archiving them.')
+        parser.add_argument('--restore', action='store_true', help=f'Attach the partitions back from {ARCHIVE_SCHEMA}.')
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError('The answers table is not partitioned; partitions only exist on Postgres.')
+        if options['exam_ids'] is None and options['older_than'] is None:
+            raise CommandError('Pass --exam or --older-than.')
+
+        if options['restore']:
+            for exam_id in options['exam_ids'] or []:
+                with transaction.atomic():
+                    restore_answer_partition(exam_id)
+                self.stdout.write(self.style.SUCCESS(f'Restored the answers of exam {exam_id}.'))
+            return
+
+        attached = attached_partitions()
+        for exam_id in self.exam_ids(options):
+            if partition_name(exam_id) not in attached:
+                self.stdout.write(f'Exam {exam_id} has no attached partition, skipping.')
+                continue
+            with transaction.atomic():
+                archive_answer_partition(exam_id, drop=options['drop'])
+            action = 'Dropped' if options['drop'] else f'Archived to {ARCHIVE_SCHEMA}'
+            self.stdout.write(self.style.SUCCESS(f'{action}: the answers of exam {exam_id}.'))
+
+    def exam_ids(self, options):
+        if options['exam_ids'] is not None:
+            return options['exam_ids']
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        # Exams that never got a submission are left alone, they may not have happened yet.
+        finished = (
+            Attempt.objects
+            .values('exam_id')
+            .annotate(last_submission=Max('submitted_at'))
+            .filter(last_submission__lt=cutoff)
+            .values_list('exam_id', flat=True)
+        )
+        return list(Exam.objects.filter(pk__in=finished).order_by('pk').values_list('pk', flat=True))
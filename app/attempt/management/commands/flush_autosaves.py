@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from attempt.autosave import flush_pending
+
+
+class Command(BaseCommand):
+    """
+    Command that writes every pending autosave buffer to the answer tables. It reads the
+    buffers from the "autosave" cache, so it only sees those of the web processes when that
+    cache is shared (AUTOSAVE_CACHE_BACKEND); run_jobs also runs it every
+    AUTOSAVE_FLUSH_INTERVAL seconds as the flush_autosaves job.
+
+    You can call it by terminal like this:
+    -> "python manage.py flush_autosaves"
+    """
+
+    def handle(self, *args, **options):
+        flushed = flush_pending()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} autosave buffers.'))
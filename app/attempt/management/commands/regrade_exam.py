@@ -0,0 +1,36 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from attempt.grading import grade_exam
+from attempt.partitions import DetachedAnswersError
+from exam.models import Exam
+
+
+class Command(BaseCommand):
+    """
+    Command that recompiles the answer key of an exam and regrades all of its attempts.
+
+    You can call it by terminal like this:
+    -> "python manage.py regrade_exam 1"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('exam_ids', nargs='+', type=int)
+
+    def handle(self, *args, **options):
+        for exam_id in options['exam_ids']:
+            if not Exam.objects.filter(pk=exam_id).exists():
+                raise CommandError(f'Exam {exam_id} does not exist.')
+
+            started = time.monotonic()
+            try:
+                result = grade_exam(exam_id)
+            except DetachedAnswersError as error:
+                raise CommandError(str(error))
+            elapsed = time.monotonic() - started
+
+            mean = result.totals.mean() if len(result.totals) else 0
+            self.stdout.write(self.style.SUCCESS(
+                f'Exam {exam_id}: graded {len(result.attempt_ids)} attempts in {elapsed:.2f}s (mean score {mean:.2f}).'
+            ))
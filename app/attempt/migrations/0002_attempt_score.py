@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempt', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attempt',
+            name='graded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attempt',
+            name='score',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempt', '0002_attempt_score'),
+        ('exam', '0002_create_exams'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['exam', '-score'], name='attempt_exam_score_idx'),
+        ),
+    ]
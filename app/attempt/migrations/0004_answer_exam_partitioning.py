@@ -0,0 +1,104 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_answer_exams(apps, schema_editor):
+    Answer = apps.get_model('attempt', 'Answer')
+    Attempt = apps.get_model('attempt', 'Attempt')
+    Answer.objects.update(
+        exam_id=models.Subquery(Attempt.objects.filter(pk=models.OuterRef('attempt_id')).values('exam_id')[:1]),
+    )
+
+
+def rebuild_answer_table(apps, schema_editor, partitioned):
+    """
+    Copies attempt_answer into a new table, partitioned by LIST (exam_id) or plain, swaps
+    them and recreates the keys, foreign keys and indexes of the model on it.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Answer = apps.get_model('attempt', 'Answer')
+    Exam = apps.get_model('exam', 'Exam')
+    table = Answer._meta.db_table
+    new_table = f'{table}_new'
+
+    # The index and foreign key of the exam column added above are deferred to the end of
+    # the migration; create them on the old table now, or the ones recreated below would
+    # clash with them.
+    for statement in schema_editor.deferred_sql:
+        schema_editor.execute(statement)
+    schema_editor.deferred_sql.clear()
+
+    schema_editor.execute(
+        f'CREATE TABLE {new_table} (LIKE {table} INCLUDING IDENTITY)'
+        + (' PARTITION BY LIST (exam_id)' if partitioned else '')
+    )
+    if partitioned:
+        schema_editor.execute(f'CREATE TABLE {table}_default PARTITION OF {new_table} DEFAULT')
+        for exam_id in Exam.objects.values_list('pk', flat=True).iterator():
+            schema_editor.execute(f'CREATE TABLE {table}_exam_{exam_id} PARTITION OF {new_table} FOR VALUES IN ({exam_id})')
+
+    schema_editor.execute(f'INSERT INTO {new_table} SELECT * FROM {table}')
+    schema_editor.execute(f'DROP TABLE {table}')
+    schema_editor.execute(f'ALTER TABLE {new_table} RENAME TO {table}')
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+    )
+
+    # The partition key has to be part of every primary key and unique constraint.
+    schema_editor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({"id, exam_id" if partitioned else "id"})'
+    )
+    for field in Answer._meta.local_fields:
+        if field.remote_field:
+            schema_editor.execute(schema_editor._create_fk_sql(Answer, field, '_fk_%(to_table)s_%(to_column)s'))
+        for statement in schema_editor._field_indexes_sql(Answer, field):
+            schema_editor.execute(statement)
+    for field_names in Answer._meta.unique_together:
+        schema_editor.execute(schema_editor._create_unique_sql(
+            Answer, [Answer._meta.get_field(field_name) for field_name in field_names],
+        ))
+
+
+def partition_answers(apps, schema_editor):
+    rebuild_answer_table(apps, schema_editor, partitioned=True)
+
+
+def unpartition_answers(apps, schema_editor):
+    rebuild_answer_table(apps, schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempt', '0003_attempt_attempt_exam_score_idx'),
+        ('exam', '0003_exam_shuffle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='exam',
+            field=models.ForeignKey(
+                editable=False, null=True, on_delete=django.db.models.deletion.CASCADE,
+                related_name='answers', to='exam.exam',
+            ),
+        ),
+        migrations.RunPython(fill_answer_exams, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='answer',
+            name='exam',
+            field=models.ForeignKey(
+                editable=False, on_delete=django.db.models.deletion.CASCADE,
+                related_name='answers', to='exam.exam',
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='answer',
+            unique_together={('exam', 'attempt', 'exam_question')},
+        ),
+        # Postgres only: other backends keep the plain table.
+        migrations.RunPython(partition_answers, reverse_code=unpartition_answers),
+    ]
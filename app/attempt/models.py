@@ -0,0 +1,42 @@
+from django.db import models
+
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative
+from student.models import Student
+
+
+class Attempt(models.Model):
+    student = models.ForeignKey(Student, related_name='attempts', on_delete=models.CASCADE)
+    exam = models.ForeignKey(Exam, related_name='attempts', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    score = models.PositiveIntegerField(null=True, blank=True)
+    graded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('student', 'exam')
+        indexes = [
+            models.Index(fields=['exam', '-score'], name='attempt_exam_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.student} - {self.exam}'
+
+
+class Answer(models.Model):
+    attempt = models.ForeignKey(Attempt, related_name='answers', on_delete=models.CASCADE)
+    exam_question = models.ForeignKey(ExamQuestion, on_delete=models.CASCADE)
+    alternative = models.ForeignKey(Alternative, on_delete=models.CASCADE)
+    # Copy of attempt.exam: on Postgres the table is partitioned by it (see attempt/partitions.py).
+    exam = models.ForeignKey(Exam, related_name='answers', on_delete=models.CASCADE, editable=False)
+
+    class Meta:
+        unique_together = ('exam', 'attempt', 'exam_question')
+
+    def __str__(self):
+        return f'{self.attempt} - {self.exam_question.number}'
+
+    def save(self, *args, **kwargs):
+        if self.exam_id is None:
+            self.exam_id = self.attempt.exam_id
+        super().save(*args, **kwargs)
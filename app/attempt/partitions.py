@@ -0,0 +1,118 @@
+"""
+On Postgres, attempt_answer is declaratively partitioned by LIST (exam_id), one partition
+per exam plus a default one catching answers of exams that have none yet. Grading and
+statistics filter on exam_id, so they only scan the partitions of their exams. Partitions
+are created when an exam is created and can be detached and archived once an exam is over
+(see the archive_answer_partitions command). Other backends keep a plain table.
+"""
+from django.db import connection
+
+from attempt.models import Answer
+
+ARCHIVE_SCHEMA = 'answer_archive'
+
+
+class DetachedAnswersError(Exception):
+    pass
+
+
+def partition_name(exam_id):
+    return f'{Answer._meta.db_table}_exam_{int(exam_id)}'
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+            [Answer._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def attached_partitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [Answer._meta.db_table],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def check_answers_attached(exam_id):
+    """
+    Raises DetachedAnswersError when the partition of an exam was archived or dropped: its
+    answers are invisible, so grading it would score every attempt zero.
+    """
+    if is_partitioned() and partition_name(exam_id) not in attached_partitions():
+        raise DetachedAnswersError(
+            f'The answers of exam {exam_id} are archived; restore them with archive_answer_partitions --restore first.'
+        )
+
+
+def create_answer_partitions(exam_ids):
+    """
+    Creates the missing partitions of the given exams. The table is created on its own and
+    then attached, which locks the parent less than CREATE TABLE ... PARTITION OF and so does
+    not block answers being written to other exams.
+    """
+    exam_ids = set(exam_ids)
+    if not exam_ids or not is_partitioned():
+        return []
+
+    table = Answer._meta.db_table
+    attached = attached_partitions()
+    missing = [exam_id for exam_id in sorted(exam_ids) if partition_name(exam_id) not in attached]
+    with connection.cursor() as cursor:
+        for exam_id in missing:
+            name = partition_name(exam_id)
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {name} (LIKE {table} INCLUDING DEFAULTS)')
+            cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ({int(exam_id)})')
+    return missing
+
+
+def archive_answer_partition(exam_id, drop=False):
+    """
+    Detaches the partition of an exam and moves it to the archive schema, or drops it.
+    Its answers are then invisible to the ORM, so grading and statistics no longer see them.
+    """
+    table = Answer._meta.db_table
+    name = partition_name(exam_id)
+    with connection.cursor() as cursor:
+        # Postgres refuses to alter a table with deferred foreign key checks still pending
+        # from earlier writes of the same transaction.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {name}')
+        if drop:
+            cursor.execute(f'DROP TABLE {name}')
+            return
+        # The archived rows must not keep attempts, questions or exams from being deleted.
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'", [name],
+        )
+        for (constraint,) in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {name} DROP CONSTRAINT {connection.ops.quote_name(constraint)}')
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}')
+        cursor.execute(f'ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}')
+
+
+def restore_answer_partition(exam_id):
+    """
+    Attaches an archived partition again, validating it against the foreign keys. Answers
+    of the exam written to the default partition while it was archived (late autosaves)
+    are moved into it first, since Postgres refuses to attach a partition whose values are
+    in the default one; archived answers win over them.
+    """
+    table = Answer._meta.db_table
+    name = partition_name(exam_id)
+    with connection.cursor() as cursor:
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f'ALTER TABLE {ARCHIVE_SCHEMA}.{name} SET SCHEMA public')
+        cursor.execute(
+            f'INSERT INTO {name} SELECT * FROM {table}_default WHERE exam_id = %s ON CONFLICT DO NOTHING', [exam_id],
+        )
+        cursor.execute(f'DELETE FROM {table}_default WHERE exam_id = %s', [exam_id])
+        cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ({int(exam_id)})')
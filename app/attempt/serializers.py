@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from question.utils import AlternativesChoices
+
+
+class AnswerItemSerializer(serializers.Serializer):
+    number = serializers.IntegerField(min_value=1)
+    option = serializers.ChoiceField(choices=AlternativesChoices.choices)
+
+
+class AnswerSheetSerializer(serializers.Serializer):
+    exam = serializers.IntegerField()
+    answers = AnswerItemSerializer(many=True)
+
+    def validate_answers(self, answers):
+        numbers = [answer['number'] for answer in answers]
+        if len(numbers) != len(set(numbers)):
+            raise serializers.ValidationError('Each question can only be answered once per sheet.')
+        return answers
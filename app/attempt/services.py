@@ -0,0 +1,130 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from attempt.autosave import abuffered_answers, aclear_buffers, buffered_answers, clear_buffers
+from attempt.models import Attempt, Answer
+from exam.shuffle import ExamShuffle
+from exam.snapshot import aget_exam_payload, get_exam_payload
+
+ATTEMPT_UPSERT = {
+    'update_conflicts': True,
+    'unique_fields': ['student', 'exam'],
+    'update_fields': ['submitted_at'],
+}
+ANSWER_UPSERT = {
+    'update_conflicts': True,
+    'unique_fields': ['exam', 'attempt', 'exam_question'],
+    'update_fields': ['alternative'],
+}
+
+
+def answer_index(payload):
+    """
+    Maps each question number of an exam payload to its ExamQuestion id and the
+    alternative ids available for each option.
+    """
+    return {
+        exam_question['number']: (
+            exam_question['id'],
+            {alternative['option']: alternative['id'] for alternative in exam_question['question']['alternatives']},
+        )
+        for exam_question in payload['questions']
+    }
+
+
+def resolve_answers(sheet, payload, student_id):
+    """
+    Validates an answer sheet against an exam payload and returns
+    (exam_question_id, alternative_id) pairs. Sheets of shuffled exams use the
+    student's displayed numbers and options, which are mapped back here.
+    """
+    if payload is None:
+        raise ValidationError({'exam': f'Exam {sheet["exam"]} does not exist.'})
+
+    index = answer_index(payload)
+    shuffle = ExamShuffle(payload, student_id) if payload.get('shuffle') else None
+    resolved = []
+    for answer in sheet['answers']:
+        number, option = answer['number'], answer['option']
+        if shuffle is not None:
+            number, option = shuffle.canonical(number, option)
+        if number not in index:
+            raise ValidationError({'answers': f'Exam {sheet["exam"]} has no question {answer["number"]}.'})
+        exam_question_id, alternatives = index[number]
+        if option not in alternatives:
+            raise ValidationError({'answers': f'Question {answer["number"]} has no option {answer["option"]}.'})
+        resolved.append((exam_question_id, alternatives[option]))
+    return resolved
+
+
+def resolve_sheet(sheet, student_id):
+    # The payload comes from the exam cache, so a hit validates the sheet without queries.
+    return resolve_answers(sheet, get_exam_payload(sheet['exam']), student_id)
+
+
+async def aresolve_sheet(sheet, student_id):
+    return resolve_answers(sheet, await aget_exam_payload(sheet['exam']), student_id)
+
+
+def check_exams(sheets):
+    exam_ids = [sheet['exam'] for sheet in sheets]
+    if len(exam_ids) != len(set(exam_ids)):
+        raise ValidationError({'exam': 'Each exam can only be submitted once per request.'})
+    return exam_ids
+
+
+def new_attempts(student, exam_ids):
+    now = timezone.now()
+    return [Attempt(student=student, exam_id=exam_id, submitted_at=now) for exam_id in exam_ids]
+
+
+def merge_buffered(resolved, buffered):
+    """
+    Puts the submitted answers over the autosaved ones, the submission being authoritative.
+    """
+    return {
+        exam_id: list({**buffered.get(exam_id, {}), **dict(answers)}.items())
+        for exam_id, answers in resolved.items()
+    }
+
+
+def new_answers(attempts, resolved):
+    return [
+        Answer(attempt=attempt, exam_id=attempt.exam_id, exam_question_id=exam_question_id, alternative_id=alternative_id)
+        for attempt in attempts
+        for exam_question_id, alternative_id in resolved[attempt.exam_id]
+    ]
+
+
+def submit_sheets(student, sheets):
+    """
+    Stores several answer sheets of a student with one upsert for the attempts and one
+    for the answers, so resubmitting the same sheet updates rows instead of adding them.
+    """
+    exam_ids = check_exams(sheets)
+    resolved = {sheet['exam']: resolve_sheet(sheet, student.pk) for sheet in sheets}
+    buffered = buffered_answers(student.pk, exam_ids)
+    resolved = merge_buffered(resolved, buffered)
+
+    with transaction.atomic():
+        attempts = Attempt.objects.bulk_create(new_attempts(student, exam_ids), **ATTEMPT_UPSERT)
+        Answer.objects.bulk_create(new_answers(attempts, resolved), **ANSWER_UPSERT)
+        clear_buffers(student.pk, exam_ids, buffered)
+    return attempts
+
+
+async def asubmit_sheets(student, sheets):
+    """
+    Async version of submit_sheets. The async ORM has no atomic blocks, so the two upserts
+    run on their own; a retry of a half-written submission converges to the same rows.
+    """
+    exam_ids = check_exams(sheets)
+    resolved = {sheet['exam']: await aresolve_sheet(sheet, student.pk) for sheet in sheets}
+    buffered = await abuffered_answers(student.pk, exam_ids)
+    resolved = merge_buffered(resolved, buffered)
+
+    attempts = await Attempt.objects.abulk_create(new_attempts(student, exam_ids), **ATTEMPT_UPSERT)
+    await Answer.objects.abulk_create(new_answers(attempts, resolved), **ANSWER_UPSERT)
+    await aclear_buffers(student.pk, exam_ids, buffered)
+    return attempts
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+
+from attempt.partitions import create_answer_partitions
+from exam.models import Exam
+
+# Sent inside the grading transaction with the GradingResult of a batch of attempts.
+attempts_graded = Signal()
+
+
+@receiver(post_save, sender=Exam)
+def create_exam_partition(sender, instance, created, **kwargs):
+    if created:
+        create_answer_partitions([instance.pk])
@@ -0,0 +1,260 @@
+import threading
+from unittest import skipUnless
+
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attempt import autosave
+from attempt.autosave import AttemptSubmitted
+from attempt.grading import GradingConflict, grade_exam, grade_submissions, store_scores
+from attempt.models import Attempt, Answer
+from attempt.services import submit_sheets
+from attempt.partitions import (
+    DetachedAnswersError, archive_answer_partition, attached_partitions, is_partitioned, partition_name,
+    restore_answer_partition,
+)
+from analytics.models import ExamScoreBucket, QuestionStatistics
+from exam import snapshot
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from question.utils import AlternativesChoices
+from student.models import Student
+from student.tokens import issue_tokens
+
+
+class AttemptFixtures:
+    def setUp(self):
+        autosave.get_cache().clear()
+        snapshot.get_cache().clear()
+        self.exam = Exam.objects.create(name='Pediatria')
+        question = Question.objects.create(content='Questão 1')
+        self.alternatives = [
+            Alternative.objects.create(question=question, content=choice.label, option=choice, is_correct=choice == AlternativesChoices.B)
+            for choice in AlternativesChoices
+        ]
+        self.exam_question = ExamQuestion.objects.create(exam=self.exam, question=question, number=1)
+        self.students = [
+            Student.objects.create(username=f'aluno{index}', email=f'aluno{index}@medway.com')
+            for index in range(3)
+        ]
+
+    def click(self, student, option):
+        return autosave.buffer_answers(student.pk, self.exam.pk, {self.exam_question.pk: self.alternatives[option - 1].pk})
+
+    def saved_option(self, student):
+        answer = Answer.objects.filter(attempt__student=student, exam=self.exam).select_related('alternative').first()
+        return answer and answer.alternative.option
+
+
+class AttemptTestCase(AttemptFixtures, TestCase):
+    pass
+
+
+class AutosaveFlushTests(AttemptTestCase):
+    def test_flush_writes_each_pending_attempt_once(self):
+        self.click(self.students[0], 1)
+        self.click(self.students[0], 2)
+        self.click(self.students[1], 3)
+
+        self.assertEqual(autosave.flush_pending(), 2)
+        self.assertEqual(self.saved_option(self.students[0]), 2)
+        self.assertEqual(self.saved_option(self.students[1]), 3)
+        self.assertEqual(autosave.flush_pending(), 0)
+
+    def test_clicks_after_a_flush_are_flushed_again(self):
+        self.click(self.students[0], 1)
+        autosave.flush_pending()
+
+        self.click(self.students[0], 4)
+        self.assertEqual(autosave.flush_pending(), 1)
+        self.assertEqual(self.saved_option(self.students[0]), 4)
+
+
+    def test_concurrent_clicks_on_different_questions_are_all_kept(self):
+        exam_questions = [self.exam_question] + [
+            ExamQuestion.objects.create(exam=self.exam, question=self.exam_question.question, number=number)
+            for number in range(2, 21)
+        ]
+        clicks = [
+            threading.Thread(target=autosave.buffer_answers, args=(self.students[0].pk, self.exam.pk, {exam_question.pk: self.alternatives[0].pk}))
+            for exam_question in exam_questions
+        ]
+        for click in clicks:
+            click.start()
+        for click in clicks:
+            click.join()
+
+        self.assertEqual(len(autosave.buffered_answers(self.students[0].pk, [self.exam.pk])[self.exam.pk]), 20)
+
+    def test_autosaves_of_a_submitted_attempt_are_refused(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        sheet = {'exam': self.exam.pk, 'answers': [{'number': 1, 'option': 3}]}
+        self.assertEqual(client.post('/api/attempts/autosave/', sheet, format='json').status_code, 202)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            submit_sheets(self.students[0], [{'exam': self.exam.pk, 'answers': [{'number': 1, 'option': 2}]}])
+
+        self.assertEqual(client.post('/api/attempts/autosave/', sheet, format='json').status_code, 409)
+        with self.assertRaises(AttemptSubmitted):
+            self.click(self.students[0], 3)
+
+    def test_buffered_answers_are_not_written_over_a_submission(self):
+        self.click(self.students[0], 3)
+        submit_sheets(self.students[0], [{'exam': self.exam.pk, 'answers': [{'number': 1, 'option': 2}]}])
+        # The submission's buffers are only cleared on commit, which never comes here.
+        self.click(self.students[0], 4)
+
+        self.assertEqual(autosave.flush_pending(), 0)
+        self.assertEqual(self.saved_option(self.students[0]), 2)
+
+class GradingTests(AttemptTestCase):
+    def test_attempts_in_progress_are_not_graded(self):
+        submitted = Attempt.objects.create(student=self.students[0], exam=self.exam, submitted_at=timezone.now())
+        Answer.objects.create(attempt=submitted, exam_question=self.exam_question, alternative=self.alternatives[1])
+        self.click(self.students[1], 2)
+        autosave.flush_pending()
+
+        result = grade_exam(self.exam.pk)
+
+        self.assertEqual(result.attempt_ids.tolist(), [submitted.pk])
+        self.assertIsNone(Attempt.objects.get(student=self.students[1]).graded_at)
+
+    def test_scores_graded_meanwhile_are_not_overwritten(self):
+        attempt = Attempt.objects.create(student=self.students[0], exam=self.exam, submitted_at=timezone.now())
+        grade_exam(self.exam.pk)
+
+        with self.assertRaises(GradingConflict):
+            store_scores([(attempt.pk, None, None)], [Attempt(pk=attempt.pk, score=1, graded_at=timezone.now())])
+        self.assertEqual(Attempt.objects.get().score, 0)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Attempts are only locked on Postgres.')
+class ConcurrentGradingTests(AttemptFixtures, TransactionTestCase):
+    def test_concurrent_gradings_count_each_attempt_once(self):
+        attempt = Attempt.objects.create(student=self.students[0], exam=self.exam, submitted_at=timezone.now())
+        Answer.objects.create(attempt=attempt, exam_question=self.exam_question, alternative=self.alternatives[1])
+        graded, release = threading.Event(), threading.Event()
+        results = []
+
+        def grade(before_commit=None):
+            try:
+                with transaction.atomic():
+                    results.append(len(grade_submissions(self.exam.pk).attempt_ids))
+                    if before_commit:
+                        before_commit()
+            finally:
+                connection.close()
+
+        def hold():
+            graded.set()
+            release.wait(5)
+
+        first = threading.Thread(target=grade, args=(hold,))
+        first.start()
+        graded.wait(5)
+        second = threading.Thread(target=grade)
+        second.start()
+        second.join(0.5)
+        self.assertTrue(second.is_alive())
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(results, [1, 0])
+        self.assertEqual(QuestionStatistics.objects.get().responses, 1)
+        self.assertEqual(ExamScoreBucket.objects.get(exam=self.exam, score=1).count, 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Answers are only partitioned on Postgres.')
+class AnswerPartitionTests(AttemptTestCase):
+    def submit(self, student, option):
+        attempt = Attempt.objects.create(student=student, exam=self.exam, submitted_at=timezone.now())
+        Answer.objects.create(attempt=attempt, exam_question=self.exam_question, alternative=self.alternatives[option - 1])
+        return attempt
+
+    def test_each_exam_gets_a_partition(self):
+        self.assertTrue(is_partitioned())
+        self.assertIn(partition_name(self.exam.pk), attached_partitions())
+
+    def test_archived_exam_is_not_graded(self):
+        self.submit(self.students[0], 2)
+        archive_answer_partition(self.exam.pk)
+
+        with self.assertRaises(DetachedAnswersError):
+            grade_exam(self.exam.pk)
+        self.assertIsNone(Attempt.objects.get().graded_at)
+
+    def test_restore_moves_late_answers_out_of_the_default_partition(self):
+        self.submit(self.students[0], 2)
+        archive_answer_partition(self.exam.pk)
+        # A late autosave of another student lands in the default partition.
+        self.click(self.students[1], 3)
+        autosave.flush_pending()
+
+        restore_answer_partition(self.exam.pk)
+
+        self.assertIn(partition_name(self.exam.pk), attached_partitions())
+        self.assertEqual(self.saved_option(self.students[0]), 2)
+        self.assertEqual(self.saved_option(self.students[1]), 3)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {Answer._meta.db_table}_default')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(grade_exam(self.exam.pk).totals.tolist(), [1])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'The migration only rebuilds the table on Postgres.')
+class AnswerPartitioningMigrationTests(TransactionTestCase):
+    before = [('attempt', '0003_attempt_attempt_exam_score_idx')]
+    after = [('attempt', '0004_answer_exam_partitioning')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def test_answers_survive_unpartitioning_and_partitioning(self):
+        exam = Exam.objects.create(name='Cirurgia')
+        question = Question.objects.create(content='Questão 1')
+        alternative = Alternative.objects.create(question=question, content='A', option=1, is_correct=True)
+        exam_question = ExamQuestion.objects.create(exam=exam, question=question, number=1)
+        student = Student.objects.create(username='aluno', email='aluno@medway.com')
+        attempt = Attempt.objects.create(student=student, exam=exam, submitted_at=timezone.now())
+        Answer.objects.create(attempt=attempt, exam_question=exam_question, alternative=alternative)
+
+        apps = self.migrate(self.before)
+        self.assertFalse(is_partitioned())
+        self.assertEqual(apps.get_model('attempt', 'Answer').objects.count(), 1)
+
+        apps = self.migrate(self.after)
+        self.assertTrue(is_partitioned())
+        self.assertIn(partition_name(exam.pk), attached_partitions())
+        self.assertEqual(apps.get_model('attempt', 'Answer').objects.filter(exam_id=exam.pk).count(), 1)
+        # The identity sequence was carried over, so new answers get fresh ids.
+        Answer.objects.create(attempt=attempt, exam_question=ExamQuestion.objects.create(exam=exam, question=question, number=2), alternative=alternative)
+        self.assertEqual(grade_exam(exam.pk).totals.tolist(), [2])
+
+
+class AsyncSubmitCsrfTests(AttemptTestCase):
+    url = '/api/async/attempts/submit/'
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client(enforce_csrf_checks=True)
+        self.sheet = {'exam': self.exam.pk, 'answers': [{'number': 1, 'option': 2}]}
+
+    def test_bearer_token_needs_no_csrf_token(self):
+        token = issue_tokens(self.students[0])['access']
+        response = self.client.post(self.url, self.sheet, content_type='application/json', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 201)
+
+    def test_session_needs_a_csrf_token(self):
+        self.client.force_login(self.students[0])
+        response = self.client.post(self.url, self.sheet, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(response.json()['detail'].startswith('CSRF Failed'))
+        self.assertFalse(Attempt.objects.exists())
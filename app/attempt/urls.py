@@ -0,0 +1,10 @@
+from django.urls import path
+
+from attempt.views import SubmitAnswersView, AutosaveView, ResultExportView, submit_answers_async
+
+urlpatterns = [
+    path('attempts/submit/', SubmitAnswersView.as_view(), name='attempt-submit'),
+    path('attempts/autosave/', AutosaveView.as_view(), name='attempt-autosave'),
+    path('async/attempts/submit/', submit_answers_async, name='attempt-submit-async'),
+    path('exports/results.<str:extension>', ResultExportView.as_view(), name='result-export'),
+]
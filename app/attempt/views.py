@@ -0,0 +1,108 @@
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from attempt.autosave import buffer_answers
+from attempt.exports import RESULT_FIELDS, result_rows
+from attempt.serializers import AnswerSheetSerializer
+from attempt.services import asubmit_sheets, resolve_sheet, submit_sheets
+from student.authentication import aget_user, unauthenticated_response
+from utils.streaming import id_param, streaming_export
+from utils.throttling import bucket_wait, throttled_response
+
+
+class SubmitAnswersView(APIView):
+    """
+    Receives a single answer sheet or a list of them:
+    {"exam": 1, "answers": [{"number": 1, "option": 3}, ...]}
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'submission'
+
+    def post(self, request):
+        many = isinstance(request.data, list)
+        serializer = AnswerSheetSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        sheets = serializer.validated_data if many else [serializer.validated_data]
+
+        attempts = submit_sheets(request.user, sheets)
+        data = submission_data(attempts)
+        return Response(data if many else data[0], status=status.HTTP_201_CREATED)
+
+
+class AutosaveView(APIView):
+    """
+    Buffers the answers of an attempt in progress, in the same shape as one sheet of
+    SubmitAnswersView. They reach the database in coalesced batches.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'autosave'
+
+    def post(self, request):
+        serializer = AnswerSheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sheet = serializer.validated_data
+
+        resolved = resolve_sheet(sheet, request.user.pk)
+        flushed = buffer_answers(request.user.pk, sheet['exam'], resolved)
+        return Response({'exam': sheet['exam'], 'flushed': flushed}, status=status.HTTP_202_ACCEPTED)
+
+
+def submission_data(attempts):
+    return [
+        {'attempt': attempt.pk, 'exam': attempt.exam_id, 'submitted_at': attempt.submitted_at}
+        for attempt in attempts
+    ]
+
+
+@csrf_exempt
+@require_POST
+async def submit_answers_async(request):
+    """
+    Async counterpart of SubmitAnswersView, served without holding a worker thread
+    while the database works when running under ASGI.
+    """
+    try:
+        user = await aget_user(request)
+    except AuthenticationFailed as error:
+        return unauthenticated_response(error.detail)
+    except PermissionDenied as error:
+        return JsonResponse({'detail': str(error.detail)}, status=status.HTTP_403_FORBIDDEN)
+    if not user.is_authenticated:
+        return unauthenticated_response()
+    wait = not user.is_staff and bucket_wait('submission', user.pk)
+    if wait:
+        return throttled_response(wait)
+
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'detail': 'Invalid JSON.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    many = isinstance(body, list)
+    serializer = AnswerSheetSerializer(data=body, many=many)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST, safe=False)
+    sheets = serializer.validated_data if many else [serializer.validated_data]
+
+    try:
+        attempts = await asubmit_sheets(user, sheets)
+    except ValidationError as error:
+        return JsonResponse(error.detail, status=status.HTTP_400_BAD_REQUEST, safe=False)
+    data = submission_data(attempts)
+    return JsonResponse(data if many else data[0], status=status.HTTP_201_CREATED, safe=False)
+
+
+class ResultExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, extension):
+        rows = result_rows(id_param(request, 'exam'))
+        return streaming_export(extension, RESULT_FIELDS, rows, 'results')
@@ -1,12 +1,93 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db import transaction
+from django.db.models import Count
 
 from exam.models import Exam, ExamQuestion
+from exam.operations import clone_exams, renumber_exams
+from exam.snapshot import rebuild_exam_payload
+from question.models import Question
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """
+    Autocomplete that labels the selected question from a dict loaded once per formset,
+    instead of querying it again for every inline row.
+    """
+    labels = None
+
+    def __deepcopy__(self, memo):
+        obj = super().__deepcopy__(memo)
+        obj.labels = self.labels
+        return obj
+
+    def optgroups(self, name, value, attr=None):
+        selected = [str(v) for v in value if str(v) not in self.choices.field.empty_values]
+        if self.labels is None or any(v not in self.labels for v in selected):
+            return super().optgroups(name, value, attr)
+
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        for v in selected:
+            options.append(self.create_option(name, v, self.labels[v], True, len(options)))
+        return [(None, options, 0)]
 
 
 class ExamQuestionInline(admin.TabularInline):
     model = ExamQuestion
+    autocomplete_fields = ('question',)
+    extra = 1
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('question', 'exam')
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'question':
+            kwargs['widget'] = PreloadedAutocompleteSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        if obj is not None:
+            widget = formset.form.base_fields['question'].widget.widget
+            widget.labels = {
+                str(question.pk): str(question)
+                for question in Question.objects.filter(examquestion__exam=obj)
+            }
+        return formset
 
 
 @admin.register(Exam)
 class ExamAdmin(admin.ModelAdmin):
     inlines = [ExamQuestionInline]
+    list_display = ('name', 'question_count', 'shuffle')
+    search_fields = ('name',)
+    list_per_page = 50
+    show_full_result_count = False
+    actions = ('renumber_questions', 'clone')
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name == 'exam_exam_changelist':
+            queryset = queryset.annotate(question_count=Count('examquestion'))
+        return queryset
+
+    @admin.display(description='questions', ordering='question_count')
+    def question_count(self, exam):
+        return exam.question_count
+
+    @admin.action(description='Renumber questions as 1..n')
+    def renumber_questions(self, request, queryset):
+        renumber_exams(queryset.values_list('pk', flat=True))
+        self.message_user(request, 'Questions renumbered.', messages.SUCCESS)
+
+    @admin.action(description='Clone selected exams')
+    def clone(self, request, queryset):
+        clones = clone_exams(queryset)
+        self.message_user(request, f'{len(clones)} exams cloned.', messages.SUCCESS)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        exam_id = form.instance.pk
+        transaction.on_commit(lambda: rebuild_exam_payload(exam_id))
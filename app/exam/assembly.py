@@ -0,0 +1,72 @@
+import random
+
+from django.db import connection, transaction
+
+from attempt.partitions import create_answer_partitions
+from exam.importer import insert_rows
+from exam.models import Exam, ExamQuestion
+from question.models import Question
+
+# How many more rows than all the draws need TABLESAMPLE should aim for, so one sample is enough.
+OVERSAMPLING = 4
+
+
+class QuestionSampler:
+    """
+    Draws random question ids without sorting the bank. The first draw loads an in-memory
+    index of ids that every later draw reuses: on Postgres, with the whole bank, a single
+    TABLESAMPLE sized for all the expected draws; otherwise every matching id.
+    """
+
+    def __init__(self, queryset=None, seed=None, draws=1):
+        self.queryset = queryset
+        self.rng = random.Random(seed)
+        self.draws = draws
+        self.ids = None
+
+    def sample(self, size):
+        if self.ids is None and self.queryset is None and connection.vendor == 'postgresql':
+            ids = self.tablesample(size * self.draws)
+            if len(ids) >= size:
+                self.ids = ids
+
+        if self.ids is None:
+            queryset = self.queryset if self.queryset is not None else Question.objects.all()
+            self.ids = list(queryset.order_by().values_list('id', flat=True).iterator(chunk_size=20000))
+        if len(self.ids) < size:
+            raise ValueError(f'Only {len(self.ids)} questions match, {size} were requested.')
+        return self.rng.sample(self.ids, size)
+
+    def tablesample(self, size):
+        table = Question._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table])
+            estimate = cursor.fetchone()[0]
+            if estimate <= 0:
+                return []
+            percent = min(100.0, 100.0 * size * OVERSAMPLING / estimate)
+            cursor.execute(f'SELECT id FROM {table} TABLESAMPLE BERNOULLI (%s)', [percent])
+            return [row[0] for row in cursor.fetchall()]
+
+
+def assemble_exams(names, size, queryset=None, seed=None, batch_size=5000):
+    """
+    Creates one exam per name with `size` questions drawn from the bank (or from the
+    given Question queryset), numbered from 1. Exams and links are bulk-inserted.
+    """
+    sampler = QuestionSampler(queryset, seed, draws=len(names))
+    exams = []
+    per_chunk = max(1, batch_size // max(size, 1))
+    for start in range(0, len(names), per_chunk):
+        chunk_names = names[start:start + per_chunk]
+        samples = [sampler.sample(size) for _ in chunk_names]
+        with transaction.atomic():
+            chunk = Exam.objects.bulk_create([Exam(name=name) for name in chunk_names])
+            create_answer_partitions([exam.pk for exam in chunk])
+            insert_rows(ExamQuestion, ['exam', 'question', 'number'], [
+                (exam.pk, question_id, number)
+                for exam, question_ids in zip(chunk, samples)
+                for number, question_id in enumerate(question_ids, start=1)
+            ], batch_size=batch_size)
+        exams += chunk
+    return exams
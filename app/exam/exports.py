@@ -0,0 +1,26 @@
+from exam.models import ExamQuestion
+from utils.streaming import EXPORT_CHUNK_SIZE
+
+CONTENT_FIELDS = (
+    'exam_id', 'exam_name', 'number', 'question_id', 'question_content',
+    'alternative_id', 'option', 'alternative_content', 'is_correct',
+)
+
+
+def exam_content_rows(exam_id=None):
+    """
+    One row per alternative of every exam question, read through a server-side cursor.
+    """
+    exam_questions = ExamQuestion.objects.all()
+    if exam_id is not None:
+        exam_questions = exam_questions.filter(exam_id=exam_id)
+    return (
+        exam_questions
+        .order_by('exam_id', 'number', 'question__alternatives__option')
+        .values_list(
+            'exam_id', 'exam__name', 'number', 'question_id', 'question__content',
+            'question__alternatives__id', 'question__alternatives__option',
+            'question__alternatives__content', 'question__alternatives__is_correct',
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
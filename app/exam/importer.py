@@ -0,0 +1,130 @@
+import io
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from attempt.partitions import create_answer_partitions
+from exam.models import Exam, ExamQuestion
+from question.dedup import existing_questions, question_hash
+from question.models import Question, Alternative
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_rows(cursor, model, fields, rows):
+    """
+    Loads rows into the table of a model with Postgres COPY, in text format.
+    """
+    columns = ', '.join(model._meta.get_field(field).column for field in fields)
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f'COPY {model._meta.db_table} ({columns}) FROM STDIN', buffer)
+
+
+def reserve_ids(cursor, model, count):
+    table = model._meta.db_table
+    cursor.execute(
+        f"SELECT nextval(pg_get_serial_sequence('{table}', 'id')) FROM generate_series(1, %s)",
+        [count],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def insert_rows(model, fields, rows, batch_size=5000):
+    """
+    Inserts rows, tuples of values for the given fields, with COPY on Postgres and with
+    batched bulk_create elsewhere. Primary keys are not returned.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            copy_rows(cursor, model, fields, rows)
+        return
+
+    attnames = [model._meta.get_field(field).attname for field in fields]
+    model.objects.bulk_create(
+        [model(**dict(zip(attnames, row))) for row in rows],
+        batch_size=batch_size,
+    )
+
+
+def insert_questions(questions_data, batch_size=5000):
+    """
+    Inserts questions and their alternatives, shaped like the questions of the
+    0002_create_exams migration. Questions whose content hash is already stored, or
+    repeated within the batch, resolve to the existing row instead of being inserted.
+    Returns the question ids in order and the number of inserted rows.
+    """
+    if not questions_data:
+        return [], 0
+
+    hashes = [question_hash(question_data) for question_data in questions_data]
+    resolved = existing_questions(hashes)
+    new = {}
+    for hash_, question_data in zip(hashes, questions_data):
+        if hash_ not in resolved:
+            new.setdefault(hash_, question_data)
+
+    if new:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                new_ids = reserve_ids(cursor, Question, len(new))
+            # COPY skips auto_now, and the updated_at column has no database default.
+            now = timezone.now()
+            insert_rows(Question, ['id', 'content', 'content_hash', 'updated_at'], (
+                (question_id, question_data['content'], hash_, now)
+                for question_id, (hash_, question_data) in zip(new_ids, new.items())
+            ))
+        else:
+            questions = Question.objects.bulk_create(
+                [Question(content=question_data['content'], content_hash=hash_) for hash_, question_data in new.items()],
+                batch_size=batch_size,
+            )
+            new_ids = [question.pk for question in questions]
+
+        alternatives = [
+            (question_id, alternative_data['content'], alternative_data['alternative'], alternative_data['is_correct'])
+            for question_id, question_data in zip(new_ids, new.values())
+            for alternative_data in question_data['alternatives']
+        ]
+        insert_rows(Alternative, ['question', 'content', 'option', 'is_correct'], alternatives, batch_size=batch_size)
+        resolved.update(zip(new, new_ids))
+
+    inserted = len(new) + sum(len(question_data['alternatives']) for question_data in new.values())
+    return [resolved[hash_] for hash_ in hashes], inserted
+
+
+def import_chunk(exams_data, batch_size=5000):
+    """
+    Imports a list of exams, shaped like the ones in the 0002_create_exams migration,
+    in a single transaction. Returns the number of inserted rows.
+    """
+    with transaction.atomic():
+        exams = Exam.objects.bulk_create([Exam(name=exam_data['name']) for exam_data in exams_data])
+        create_answer_partitions([exam.pk for exam in exams])
+        numbered = [
+            (exam, number, question_data)
+            for exam, exam_data in zip(exams, exams_data)
+            for number, question_data in enumerate(exam_data['questions'], start=1)
+        ]
+        question_ids, inserted = insert_questions([question_data for _, _, question_data in numbered], batch_size)
+        insert_rows(ExamQuestion, ['exam', 'question', 'number'], [
+            (exam.pk, question_id, number)
+            for question_id, (exam, number, _) in zip(question_ids, numbered)
+        ], batch_size=batch_size)
+
+    return len(exams) + len(numbered) + inserted
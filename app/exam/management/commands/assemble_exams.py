@@ -0,0 +1,40 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from exam.assembly import assemble_exams
+from question.filters import QuestionFilter
+from question.models import Question
+
+
+class Command(BaseCommand):
+    """
+    Command that builds randomized exams from the question bank in one batch.
+
+    You can call it by terminal like this:
+    -> "python manage.py assemble_exams --count 1000 --size 120 --name 'Simulado' --search cardiologia"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1)
+        parser.add_argument('--size', type=int, required=True)
+        parser.add_argument('--name', default='Simulado')
+        parser.add_argument('--search', help='Only draw questions matching this search.')
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        queryset = None
+        if options['search']:
+            queryset = QuestionFilter({'search': options['search']}, queryset=Question.objects.all()).qs
+
+        names = [f'{options["name"]} {index}' for index in range(1, options['count'] + 1)]
+        started = time.monotonic()
+        try:
+            exams = assemble_exams(names, options['size'], queryset, options['seed'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Assembled {len(exams)} exams of {options["size"]} questions in {elapsed:.2f}s.'
+        ))
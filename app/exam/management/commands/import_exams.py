@@ -0,0 +1,65 @@
+import json
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from exam.importer import import_chunk
+
+
+class Command(BaseCommand):
+    """
+    Command that imports exams from a JSONL file, one exam per line, in the same shape
+    as the exams of the 0002_create_exams migration. Every chunk of exams is committed
+    on its own, so an interrupted import can be resumed with --start-line.
+
+    You can call it by terminal like this:
+    -> "python manage.py import_exams exams.jsonl --chunk-size 500"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Exams committed per transaction.')
+        parser.add_argument('--start-line', type=int, default=1, help='First line of the file to import.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        start_line = options['start_line']
+
+        started = time.monotonic()
+        total_rows = 0
+        chunk = []
+        chunk_start = start_line
+
+        with open(options['path'], encoding='utf-8') as file:
+            for line_number, line in enumerate(file, start=1):
+                if line_number < start_line or not line.strip():
+                    continue
+                try:
+                    chunk.append(json.loads(line))
+                except json.JSONDecodeError as error:
+                    raise CommandError(f'Invalid JSON on line {line_number}: {error}')
+
+                if len(chunk) >= chunk_size:
+                    total_rows += self.import_chunk(chunk, chunk_start, line_number, started, total_rows)
+                    chunk = []
+                    chunk_start = line_number + 1
+
+            if chunk:
+                total_rows += self.import_chunk(chunk, chunk_start, line_number, started, total_rows)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Imported {total_rows} rows in {elapsed:.2f}s.'))
+
+    def import_chunk(self, chunk, first_line, last_line, started, total_rows):
+        try:
+            rows = import_chunk(chunk)
+        except (KeyError, TypeError, ValueError) as error:
+            raise CommandError(
+                f'Could not import lines {first_line}-{last_line} ({error!r}). '
+                f'Fix the file and resume with --start-line {first_line}.'
+            )
+
+        elapsed = time.monotonic() - started
+        rate = (total_rows + rows) / elapsed if elapsed else 0
+        self.stdout.write(f'Lines {first_line}-{last_line} committed: {rows} rows ({rate:.0f} rows/s).')
+        return rows
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam', '0002_create_exams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='shuffle',
+            field=models.BooleanField(default=False, help_text='Deliver questions and alternatives in a per-student order.'),
+        ),
+    ]
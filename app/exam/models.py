@@ -5,7 +5,10 @@ from question.models import Question
 
 class Exam(models.Model):
     name = models.CharField(max_length=100)
+    shuffle = models.BooleanField(default=False, help_text='Deliver questions and alternatives in a per-student order.')
     questions = models.ManyToManyField(Question, through='ExamQuestion', related_name='questions')
+    # Bumped by exam/signals.py when the questions or alternatives of the exam change too.
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
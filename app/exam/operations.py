@@ -0,0 +1,62 @@
+from django.db import connection, transaction
+
+from attempt.partitions import create_answer_partitions
+from exam.models import Exam, ExamQuestion
+from exam.snapshot import invalidate_exams, touch_exams
+
+
+def renumber_exams(exam_ids):
+    """
+    Renumbers the questions of each exam as 1..n, keeping their order, with two UPDATEs.
+    The first moves every number past the current maximum so the second never collides
+    with the (exam, number) unique constraint half-way through.
+    """
+    exam_ids = list(exam_ids)
+    if not exam_ids:
+        return
+    table = ExamQuestion._meta.db_table
+    placeholders = ', '.join(['%s'] * len(exam_ids))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} SET number = number + (SELECT MAX(number) FROM {table}) '
+            f'WHERE exam_id IN ({placeholders})',
+            exam_ids,
+        )
+        cursor.execute(
+            f'UPDATE {table} SET number = ranked.position '
+            f'FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY exam_id ORDER BY number) AS position '
+            f'FROM {table} WHERE exam_id IN ({placeholders})) AS ranked '
+            f'WHERE {table}.id = ranked.id',
+            exam_ids,
+        )
+        invalidate_exams(exam_ids)
+        touch_exams(exam_ids)
+
+
+def clone_exams(exams):
+    """
+    Copies the exams with one bulk insert and their question links with a single
+    INSERT ... SELECT, joined on the mapping from each exam to its clone.
+    """
+    exams = list(exams)
+    if not exams:
+        return []
+    table = ExamQuestion._meta.db_table
+
+    with transaction.atomic():
+        # bulk_create skips the post_save signal that creates answer partitions.
+        clones = Exam.objects.bulk_create([
+            Exam(name=f'{exam.name} (cópia)'[:100], shuffle=exam.shuffle) for exam in exams
+        ])
+        create_answer_partitions([clone.pk for clone in clones])
+        mapping = ' UNION ALL '.join(
+            f'SELECT {int(exam.pk)} AS exam_id, {int(clone.pk)} AS clone_id' for exam, clone in zip(exams, clones)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (exam_id, question_id, number) '
+                f'SELECT mapping.clone_id, {table}.question_id, {table}.number FROM {table} '
+                f'JOIN ({mapping}) AS mapping ON {table}.exam_id = mapping.exam_id'
+            )
+    return clones
@@ -0,0 +1,19 @@
+from django.db.models import Prefetch
+
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative
+
+
+def exam_delivery_queryset():
+    """
+    Exams with their questions and alternatives loaded in three queries, no matter
+    how many questions the exam has: the exam, its ExamQuestion rows joined with
+    Question, and every Alternative of those questions.
+    """
+    exam_questions = (
+        ExamQuestion.objects
+        .select_related('question')
+        .prefetch_related(Prefetch('question__alternatives', queryset=Alternative.objects.order_by('option')))
+        .order_by('number')
+    )
+    return Exam.objects.prefetch_related(Prefetch('examquestion_set', queryset=exam_questions))
@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from exam.models import Exam, ExamQuestion
+from question.serializers import QuestionSerializer
+
+
+class ExamQuestionSerializer(serializers.ModelSerializer):
+    question = QuestionSerializer(read_only=True)
+
+    class Meta:
+        model = ExamQuestion
+        fields = ('id', 'number', 'question')
+
+
+class ExamListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Exam
+        fields = ('id', 'name')
+
+
+class ExamSerializer(serializers.ModelSerializer):
+    questions = ExamQuestionSerializer(source='examquestion_set', many=True, read_only=True)
+
+    class Meta:
+        model = Exam
+        fields = ('id', 'name', 'shuffle', 'updated_at', 'questions')
+
+
+class ExamAssemblySerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+    count = serializers.IntegerField(min_value=1, max_value=1000, default=1)
+    search = serializers.CharField(required=False)
+    seed = serializers.IntegerField(required=False)
@@ -0,0 +1,82 @@
+import hashlib
+import hmac
+import random
+
+from django.conf import settings
+
+
+def permutation_seed(student_id, exam_id):
+    message = f'{student_id}:{exam_id}'.encode()
+    digest = hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def without_id(item):
+    return {key: value for key, value in item.items() if key != 'id'}
+
+
+class ExamShuffle:
+    """
+    Question and alternative order of an exam as seen by one student. The permutation is
+    derived from a keyed hash of (student, exam), so it is never stored and is rebuilt
+    identically from the cached exam payload on every request.
+    """
+
+    def __init__(self, payload, student_id):
+        rng = random.Random(permutation_seed(student_id, payload['id']))
+
+        questions = list(payload['questions'])
+        rng.shuffle(questions)
+        self.questions = questions
+        # Displayed number -> canonical number.
+        self.numbers = {position: question['number'] for position, question in enumerate(questions, start=1)}
+
+        # Canonical number -> alternatives in displayed order.
+        self.alternatives = {}
+        for question in questions:
+            alternatives = list(question['question']['alternatives'])
+            rng.shuffle(alternatives)
+            self.alternatives[question['number']] = alternatives
+
+    def apply(self, payload):
+        """
+        Returns the payload in this student's order. Ids are left out: they grow with the
+        canonical number and option, so sorting by them would undo the shuffle, and the
+        bank ids would let students compare answers question by question.
+        """
+        return {
+            **payload,
+            'questions': [
+                {
+                    **without_id(exam_question),
+                    'number': position,
+                    'question': {
+                        **without_id(exam_question['question']),
+                        'alternatives': [
+                            {**without_id(alternative), 'option': option}
+                            for option, alternative in enumerate(self.alternatives[exam_question['number']], start=1)
+                        ],
+                    },
+                }
+                for position, exam_question in enumerate(self.questions, start=1)
+            ],
+        }
+
+    def canonical(self, number, option):
+        """
+        Maps a displayed (number, option) pair back to the canonical one, or returns None
+        for the parts that do not exist.
+        """
+        canonical_number = self.numbers.get(number)
+        if canonical_number is None:
+            return None, None
+        alternatives = self.alternatives[canonical_number]
+        if not 1 <= option <= len(alternatives):
+            return canonical_number, None
+        return canonical_number, alternatives[option - 1]['option']
+
+
+def delivered_payload(payload, student_id):
+    if not payload.get('shuffle'):
+        return payload
+    return ExamShuffle(payload, student_id).apply(payload)
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from exam.models import Exam, ExamQuestion
+from exam.snapshot import exam_ids_for_question, invalidate_exams, touch_exams
+from question.models import Question, Alternative
+
+
+@receiver([post_save, post_delete], sender=Exam)
+def invalidate_exam(sender, instance, **kwargs):
+    invalidate_exams([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ExamQuestion)
+def invalidate_exam_question(sender, instance, **kwargs):
+    invalidate_exams([instance.exam_id])
+    touch_exams([instance.exam_id])
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_question(sender, instance, **kwargs):
+    exam_ids = list(exam_ids_for_question(instance.pk))
+    invalidate_exams(exam_ids)
+    touch_exams(exam_ids)
+
+
+@receiver([post_save, post_delete], sender=Alternative)
+def invalidate_alternative(sender, instance, **kwargs):
+    Question.objects.filter(pk=instance.question_id).update(updated_at=timezone.now())
+    exam_ids = list(exam_ids_for_question(instance.question_id))
+    invalidate_exams(exam_ids)
+    touch_exams(exam_ids)
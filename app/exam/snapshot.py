@@ -0,0 +1,138 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from exam.models import Exam, ExamQuestion
+from exam.queries import exam_delivery_queryset
+from exam.serializers import ExamSerializer
+from utils.cache import aget_version, bump_versions, get_version
+from utils.routers import use_primary
+
+PAYLOAD_VERSION = 4
+
+
+class CacheCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+counters = CacheCounters()
+
+
+def get_cache():
+    return caches[settings.EXAM_CACHE_ALIAS]
+
+
+def version_name(exam_id):
+    return f'exam:{exam_id}'
+
+
+def payload_key(exam_id, version):
+    return f'exam-payload:v{PAYLOAD_VERSION}:{exam_id}:{version}'
+
+
+# Payloads are cached until the next change, so they are never built from a lagging replica.
+@use_primary()
+def build_exam_payload(exam_id):
+    exam = exam_delivery_queryset().filter(pk=exam_id).first()
+    if exam is None:
+        return None
+    return ExamSerializer(exam).data
+
+
+def cache_exam_payload(exam_id, version):
+    payload = build_exam_payload(exam_id)
+    if payload is not None:
+        get_cache().set(payload_key(exam_id, version), payload)
+    return payload
+
+
+def rebuild_exam_payload(exam_id):
+    """
+    Replaces the cached payload of an exam by a fresh one, right after a change commits.
+    """
+    bump_versions(get_cache(), [version_name(exam_id)])
+    return cache_exam_payload(exam_id, get_version(get_cache(), version_name(exam_id)))
+
+
+def get_exam_payload(exam_id):
+    """
+    Returns the compiled delivery payload of an exam, or None when it does not exist.
+    A cache hit does not touch the database.
+    """
+    # The version is read before the payload is built, so a payload built from data
+    # changed meanwhile is cached under a version that is already superseded.
+    version = get_version(get_cache(), version_name(exam_id))
+    payload = get_cache().get(payload_key(exam_id, version))
+    if payload is not None:
+        counters.hit()
+        return payload
+
+    counters.miss()
+    return cache_exam_payload(exam_id, version)
+
+
+async def abuild_exam_payload(exam_id):
+    with use_primary():
+        exam = await exam_delivery_queryset().filter(pk=exam_id).afirst()
+        if exam is None:
+            return None
+        return ExamSerializer(exam).data
+
+
+async def aget_exam_payload(exam_id):
+    """
+    Async version of get_exam_payload, building a missing payload with the async ORM.
+    """
+    version = await aget_version(get_cache(), version_name(exam_id))
+    payload = await get_cache().aget(payload_key(exam_id, version))
+    if payload is not None:
+        counters.hit()
+        return payload
+
+    counters.miss()
+    payload = await abuild_exam_payload(exam_id)
+    if payload is not None:
+        await get_cache().aset(payload_key(exam_id, version), payload)
+    return payload
+
+
+def invalidate_exams(exam_ids):
+    """
+    Supersedes the cached payloads of the given exams, in every process sharing the exam
+    cache, once the current transaction commits.
+    """
+    names = [version_name(exam_id) for exam_id in set(exam_ids)]
+    if names:
+        transaction.on_commit(lambda: bump_versions(get_cache(), names))
+
+
+def touch_exams(exam_ids):
+    """
+    Moves the updated_at of exams whose content changed without saving the Exam row,
+    which is what their ETag and Last-Modified headers are derived from.
+    """
+    exam_ids = list(exam_ids)
+    if exam_ids:
+        Exam.objects.filter(pk__in=exam_ids).update(updated_at=timezone.now())
+
+
+def exam_ids_for_question(question_id):
+    return ExamQuestion.objects.filter(question_id=question_id).values_list('exam_id', flat=True).distinct()
@@ -1,3 +1,133 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from exam import snapshot
+from exam.models import Exam, ExamQuestion
+from exam.operations import clone_exams, renumber_exams
+from exam.shuffle import ExamShuffle, delivered_payload
+from question.models import Question
+from utils.cache import get_version
+
+
+def exam_payload(questions=6, options=5):
+    return {
+        'id': 7,
+        'name': 'Simulado',
+        'shuffle': True,
+        'updated_at': '2026-01-01T00:00:00Z',
+        'questions': [
+            {
+                'id': 100 + number,
+                'number': number,
+                'question': {
+                    'id': 200 + number,
+                    'content': f'Questão {number}',
+                    'alternatives': [
+                        {'id': 1000 + 10 * number + option, 'option': option, 'content': f'{number}{option}'}
+                        for option in range(1, options + 1)
+                    ],
+                },
+            }
+            for number in range(1, questions + 1)
+        ],
+    }
+
+
+class ExamShuffleTests(SimpleTestCase):
+    def test_displayed_answers_map_back_to_canonical_ones(self):
+        payload = exam_payload()
+        delivered = delivered_payload(payload, student_id=3)
+        shuffle = ExamShuffle(payload, 3)
+
+        for exam_question in delivered['questions']:
+            for alternative in exam_question['question']['alternatives']:
+                number, option = shuffle.canonical(exam_question['number'], alternative['option'])
+                self.assertEqual(alternative['content'], f'{number}{option}')
+                self.assertEqual(exam_question['question']['content'], f'Questão {number}')
+
+    def test_order_is_stable_per_student(self):
+        payload = exam_payload()
+        self.assertEqual(delivered_payload(payload, 3), delivered_payload(payload, 3))
+        self.assertNotEqual(delivered_payload(payload, 3), delivered_payload(payload, 4))
+
+    def test_delivery_leaves_out_ids(self):
+        delivered = delivered_payload(exam_payload(), student_id=3)
+
+        self.assertEqual(delivered['id'], 7)
+        for exam_question in delivered['questions']:
+            self.assertNotIn('id', exam_question)
+            self.assertNotIn('id', exam_question['question'])
+            for alternative in exam_question['question']['alternatives']:
+                self.assertNotIn('id', alternative)
+
+    def test_unknown_answers_are_not_mapped(self):
+        shuffle = ExamShuffle(exam_payload(questions=2), 3)
+        self.assertEqual(shuffle.canonical(3, 1), (None, None))
+        self.assertIsNone(shuffle.canonical(1, 6)[1])
+
+    def test_unshuffled_exams_are_delivered_as_is(self):
+        payload = {**exam_payload(), 'shuffle': False}
+        self.assertIs(delivered_payload(payload, 3), payload)
+
+
+class ExamPayloadCacheTests(TestCase):
+    def setUp(self):
+        self.exam = Exam.objects.create(name='Simulado')
+        snapshot.get_cache().clear()
+
+    def test_payload_built_before_a_change_is_not_served_after_it(self):
+        version = get_version(snapshot.get_cache(), snapshot.version_name(self.exam.pk))
+        stale = snapshot.build_exam_payload(self.exam.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Exam.objects.filter(pk=self.exam.pk).update(name='Simulado revisado')
+            snapshot.invalidate_exams([self.exam.pk])
+        snapshot.get_cache().set(snapshot.payload_key(self.exam.pk, version), stale)
+
+        self.assertEqual(snapshot.get_exam_payload(self.exam.pk)['name'], 'Simulado revisado')
+
+
+class ExamOperationsTests(TestCase):
+    def setUp(self):
+        self.questions = [Question.objects.create(content=f'Questão {number}') for number in range(1, 5)]
+
+    def create_exam(self, name, numbers):
+        exam = Exam.objects.create(name=name)
+        for question, number in zip(self.questions, numbers):
+            ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        return exam
+
+    def links(self, exam):
+        return list(ExamQuestion.objects.filter(exam=exam).order_by('number').values_list('question_id', 'number'))
+
+    def test_renumber_closes_gaps_and_keeps_the_order(self):
+        first = self.create_exam('Clínica', [3, 7, 8, 20])
+        second = self.create_exam('Cirurgia', [2, 5])
+        untouched = self.create_exam('Pediatria', [4, 9])
+
+        renumber_exams([first.pk, second.pk])
+
+        self.assertEqual(self.links(first), [(question.pk, number) for number, question in enumerate(self.questions, start=1)])
+        self.assertEqual(self.links(second), [(self.questions[0].pk, 1), (self.questions[1].pk, 2)])
+        self.assertEqual([number for _, number in self.links(untouched)], [4, 9])
+
+    def test_renumbering_twice_changes_nothing(self):
+        exam = self.create_exam('Clínica', [1, 2, 3])
+        renumber_exams([exam.pk])
+        self.assertEqual([number for _, number in self.links(exam)], [1, 2, 3])
+
+    def test_clones_copy_the_question_links(self):
+        first = self.create_exam('Clínica', [1, 2, 3])
+        second = self.create_exam('Cirurgia', [5, 6])
+        Exam.objects.filter(pk=second.pk).update(shuffle=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            clones = clone_exams(Exam.objects.filter(pk__in=[first.pk, second.pk]).order_by('pk'))
+        # One insert for the exams and one for all their question links.
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('INSERT')]), 2)
+
+        self.assertEqual([clone.name for clone in clones], ['Clínica (cópia)', 'Cirurgia (cópia)'])
+        self.assertEqual([clone.shuffle for clone in clones], [False, True])
+        self.assertEqual(self.links(clones[0]), self.links(first))
+        self.assertEqual(self.links(clones[1]), self.links(second))
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from exam.views import (
+    ExamListView, ExamDetailView, ExamQuestionListView, ExamCacheStatsView, ExamExportView,
+    ExamAssemblyView, exam_detail_async,
+)
+
+urlpatterns = [
+    path('exams/', ExamListView.as_view(), name='exam-list'),
+    path('exams/assemble/', ExamAssemblyView.as_view(), name='exam-assemble'),
+    path('exams/cache-stats/', ExamCacheStatsView.as_view(), name='exam-cache-stats'),
+    path('exams/<int:pk>/', ExamDetailView.as_view(), name='exam-detail'),
+    path('async/exams/<int:pk>/', exam_detail_async, name='exam-detail-async'),
+    path('exams/<int:pk>/questions/', ExamQuestionListView.as_view(), name='exam-question-list'),
+    path('exports/exams.<str:extension>', ExamExportView.as_view(), name='exam-export'),
+]
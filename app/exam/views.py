@@ -1,3 +1,145 @@
-from django.shortcuts import render
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from exam import snapshot
+from exam.assembly import assemble_exams
+from exam.exports import CONTENT_FIELDS, exam_content_rows
+from exam.models import Exam, ExamQuestion
+from exam.serializers import ExamAssemblySerializer, ExamListSerializer, ExamQuestionSerializer
+from exam.shuffle import delivered_payload
+from question.filters import QuestionFilter
+from question.models import Question, Alternative
+from student.authentication import aget_user, unauthenticated_response
+from utils.conditional import ConditionalListMixin, make_etag, not_modified, set_validators
+from utils.pagination import SelectablePagination
+from utils.renderers import json_response
+from utils.streaming import id_param, streaming_export
+from utils.throttling import bucket_wait, throttled_response
+
+
+class ExamListView(ConditionalListMixin, generics.ListAPIView):
+    queryset = Exam.objects.order_by('id')
+    serializer_class = ExamListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SelectablePagination
+    keyset_ordering = ('id',)
+
+
+class ExamQuestionListView(ConditionalListMixin, generics.ListAPIView):
+    serializer_class = ExamQuestionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SelectablePagination
+    keyset_ordering = ('exam', 'number')
+    version_field = 'exam__updated_at'
+
+    def get_queryset(self):
+        queryset = ExamQuestion.objects.filter(exam_id=self.kwargs['pk'])
+        if not self.request.user.is_staff:
+            # Shuffled exams are only delivered in each student's order, by ExamDetailView.
+            queryset = queryset.filter(exam__shuffle=False)
+        return (
+            queryset
+            .select_related('question')
+            .prefetch_related(Prefetch('question__alternatives', queryset=Alternative.objects.order_by('option')))
+        )
+
+
+def payload_validators(payload, student_id, format):
+    """
+    Returns the ETag and Last-Modified of an exam payload. Shuffled exams are delivered
+    differently to each student, so their ETag depends on the student too.
+    """
+    modified = parse_datetime(payload['updated_at'])
+    student = student_id if payload.get('shuffle') else ''
+    return make_etag(payload['id'], payload['updated_at'], student, format), modified
+
+
+class ExamDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'exam-delivery'
+
+    def get(self, request, pk):
+        payload = snapshot.get_exam_payload(pk)
+        if payload is None:
+            raise Http404
+
+        etag, modified = payload_validators(payload, request.user.pk, request.accepted_renderer.format)
+        response = not_modified(request, etag, modified)
+        if response is None:
+            response = Response(delivered_payload(payload, request.user.pk))
+        return set_validators(response, etag, modified, private=payload['shuffle'])
+
+
+@require_GET
+async def exam_detail_async(request, pk):
+    """
+    Async counterpart of ExamDetailView for ASGI deployments.
+    """
+    try:
+        user = await aget_user(request)
+    except AuthenticationFailed as error:
+        return unauthenticated_response(error.detail)
+    if not user.is_authenticated:
+        return unauthenticated_response()
+    wait = not user.is_staff and bucket_wait('exam-delivery', user.pk)
+    if wait:
+        return throttled_response(wait)
+
+    payload = await snapshot.aget_exam_payload(pk)
+    if payload is None:
+        return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    etag, modified = payload_validators(payload, user.pk, 'json')
+    response = not_modified(request, etag, modified)
+    if response is None:
+        response = json_response(delivered_payload(payload, user.pk))
+    return set_validators(response, etag, modified, private=payload['shuffle'])
+
+
+class ExamCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(snapshot.counters.as_dict())
+
+
+class ExamExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, extension):
+        rows = exam_content_rows(id_param(request, 'exam'))
+        return streaming_export(extension, CONTENT_FIELDS, rows, 'exams')
+
+
+class ExamAssemblyView(APIView):
+    """
+    Creates `count` exams named "<name> <n>" (or just "<name>" for a single one) with
+    `size` random questions, optionally only those matching `search`.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = ExamAssemblySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        queryset = None
+        if data.get('search'):
+            queryset = QuestionFilter({'search': data['search']}, queryset=Question.objects.all()).qs
+        if data['count'] == 1:
+            names = [data['name']]
+        else:
+            names = [f'{data["name"]} {index}' for index in range(1, data['count'] + 1)]
+
+        try:
+            exams = assemble_exams(names, data['size'], queryset, data.get('seed'))
+        except ValueError as error:
+            raise ValidationError({'size': str(error)})
+        return Response(ExamListSerializer(exams, many=True).data, status=status.HTTP_201_CREATED)
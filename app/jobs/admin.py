@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'progress', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'attempts', 'progress', 'progress_message', 'result', 'error', 'worker',
+        'created_at', 'started_at', 'heartbeat_at', 'finished_at',
+    )
+    show_full_result_count = False
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from django.conf import settings
+
+from analytics.ranking import rebuild_histogram
+from analytics.statistics import rebuild_statistics
+from attempt.autosave import flush_pending
+from attempt.exports import RESULT_FIELDS, result_rows
+from attempt.grading import grade_exam, grade_submissions
+from exam.exports import CONTENT_FIELDS, exam_content_rows
+from exam.models import Exam
+from jobs.queue import job_progress
+from jobs.registry import handler
+from utils.streaming import EXPORT_CHUNK_SIZE, export_lines
+
+
+@handler('regrade_exam')
+def regrade_exam(job, exam_id):
+    result = grade_exam(exam_id)
+    return {'graded': len(result.attempt_ids)}
+
+
+@handler('grade_submissions')
+def grade_exam_submissions(job, exam_id):
+    result = grade_submissions(exam_id)
+    return {'graded': len(result.attempt_ids)}
+
+
+@handler('rebuild_statistics')
+def rebuild_question_statistics(job, question_ids=None):
+    return {'questions': rebuild_statistics(question_ids)}
+
+
+@handler('rebuild_rankings')
+def rebuild_rankings(job, exam_ids=None):
+    if exam_ids is None:
+        exam_ids = list(Exam.objects.values_list('pk', flat=True))
+    for done, exam_id in enumerate(exam_ids, start=1):
+        rebuild_histogram(exam_id)
+        job_progress(job, done / len(exam_ids), f'{done}/{len(exam_ids)} exams')
+    return {'exams': len(exam_ids)}
+
+
+@handler('flush_autosaves')
+def flush_autosaves(job):
+    return {'flushed': flush_pending()}
+
+
+def write_export(job, kind, file_format, fields, rows):
+    path = Path(settings.JOB_EXPORT_ROOT) / f'{kind}-{job.pk}.{file_format}'
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        for line in export_lines(file_format, fields, rows):
+            file.write(line)
+            written += 1
+            if written % EXPORT_CHUNK_SIZE == 0:
+                job_progress(job, 0, f'{written} lines')
+    return {'path': str(path), 'lines': written}
+
+
+@handler('export_results')
+def export_results(job, exam_id=None, file_format='csv'):
+    return write_export(job, 'results', file_format, RESULT_FIELDS, result_rows(exam_id))
+
+
+@handler('export_exams')
+def export_exams(job, exam_id=None, file_format='csv'):
+    return write_export(job, 'exams', file_format, CONTENT_FIELDS, exam_content_rows(exam_id))
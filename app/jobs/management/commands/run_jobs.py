@@ -0,0 +1,78 @@
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connections
+
+from jobs.models import Job
+from jobs.queue import claim, run, schedule
+
+
+class Command(BaseCommand):
+    """
+    Command that runs background jobs with N concurrent workers, each one a thread with its
+    own database connection. More capacity is a matter of running more of these processes.
+    Another thread keeps the recurring jobs of JOB_SCHEDULE enqueued. Stops after the
+    running jobs on SIGINT/SIGTERM.
+
+    You can call it by terminal like this:
+    -> "python manage.py run_jobs --workers 4"
+    -> "python manage.py run_jobs --burst" (exits once the queue is empty)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls of an empty queue.')
+        parser.add_argument('--burst', action='store_true', help='Exit when there are no due jobs.')
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *args: self.stop.set())
+
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        workers = [
+            threading.Thread(target=self.work, args=(f'{prefix}:{index}', options), name=f'job-worker-{index}')
+            for index in range(options['workers'])
+        ]
+        if not options['burst'] and settings.JOB_SCHEDULE:
+            workers.append(threading.Thread(target=self.schedule, args=(options,), name='job-scheduler'))
+        self.stdout.write(f'Starting {options["workers"]} job workers.')
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS('Job workers stopped.'))
+
+    def work(self, name, options):
+        try:
+            while not self.stop.is_set():
+                job = claim(name)
+                if job is None:
+                    if options['burst']:
+                        return
+                    self.stop.wait(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f'[{name}] {job.name} #{job.pk} attempt {job.attempts}/{job.max_attempts}')
+                status = run(job)
+                if status is None:
+                    self.stdout.write(self.style.WARNING(f'[{name}] {job.name} #{job.pk} was claimed again, outcome dropped'))
+                    continue
+                style = self.style.SUCCESS if status == Job.Status.DONE else self.style.ERROR
+                self.stdout.write(style(f'[{name}] {job.name} #{job.pk} {status}'))
+        finally:
+            connections.close_all()
+
+    def schedule(self, options):
+        try:
+            while not self.stop.is_set():
+                for name, every in settings.JOB_SCHEDULE.items():
+                    schedule(name, every)
+                self.stop.wait(options['poll_interval'])
+        finally:
+            connections.close_all()
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='recurring',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('recurring', True)), fields=('name',), name='job_recurring_name_unique'),
+        ),
+    ]
@@ -0,0 +1,153 @@
+"""
+Job queue on the project database.
+
+Workers claim the oldest due job with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+workers never wait on each other, and mark it running with a conditional UPDATE, which
+also keeps backends without row locks from handing a job to two workers. Failed jobs are
+retried with exponential backoff until max_attempts. While a handler runs, a thread
+refreshes the job's heartbeat every JOB_HEARTBEAT_INTERVAL seconds, so a running job whose
+heartbeat is older than JOB_STALE_AFTER seconds belonged to a worker that died: it is
+claimed again, or marked failed once it has used up its attempts. A worker only records
+the outcome of its own attempt, so one that comes back after its job was claimed again
+leaves the new attempt alone.
+Recurring jobs (JOB_SCHEDULE) are kept enqueued by schedule() in a single row per name,
+which a partial unique index keeps single when several run_jobs processes start at once.
+"""
+import random
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import handlers
+
+
+def enqueue(name, payload=None, run_at=None, max_attempts=3):
+    if name not in handlers:
+        raise ValueError(f'Unknown job: {name}')
+    return Job.objects.create(
+        name=name, payload=payload or {}, run_at=run_at or timezone.now(), max_attempts=max_attempts,
+    )
+
+
+def schedule(name, every):
+    """
+    Enqueues a recurring job to run `every` seconds from now, unless it is queued or
+    running already. Returns whether it was enqueued.
+    """
+    if name not in handlers:
+        raise ValueError(f'Unknown job: {name}')
+    run_at = timezone.now() + timedelta(seconds=every)
+    job, created = Job.objects.get_or_create(name=name, recurring=True, defaults={'run_at': run_at})
+    if created:
+        return True
+    requeued = Job.objects.filter(pk=job.pk).exclude(status__in=(Job.Status.QUEUED, Job.Status.RUNNING)).update(
+        status=Job.Status.QUEUED, run_at=run_at, attempts=0, worker='', progress=0,
+        progress_message='', error='', started_at=None, heartbeat_at=None, finished_at=None,
+    )
+    return bool(requeued)
+
+
+def claim(worker):
+    now = timezone.now()
+    stale = Q(status=Job.Status.RUNNING, heartbeat_at__lt=now - timedelta(seconds=settings.JOB_STALE_AFTER))
+    Job.objects.filter(stale, attempts__gte=F('max_attempts')).update(
+        status=Job.Status.FAILED, finished_at=now, error='The worker running the last attempt stopped responding.',
+    )
+    due = Q(status=Job.Status.QUEUED, run_at__lte=now) | (stale & Q(attempts__lt=F('max_attempts')))
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by('run_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts).update(
+            status=Job.Status.RUNNING, attempts=F('attempts') + 1, worker=worker,
+            started_at=now, heartbeat_at=now, progress=0, progress_message='',
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def attempt_of(job):
+    """
+    The job row while it still runs the attempt the given claim started.
+    """
+    return Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, worker=job.worker, attempts=job.attempts)
+
+
+def job_progress(job, progress, message=''):
+    """
+    Records the progress of a running job, between 0 and 1, and keeps it from looking stale.
+    """
+    job.progress = progress
+    job.progress_message = message[:255]
+    Job.objects.filter(pk=job.pk).update(
+        progress=progress, progress_message=job.progress_message, heartbeat_at=timezone.now(),
+    )
+
+
+@contextmanager
+def heartbeat(job):
+    """
+    Refreshes the heartbeat of a job from another thread, with its own connection, while
+    the block runs, so long handlers never look stale without calling job_progress. It stops
+    once the attempt is no longer the job's current one.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                if not attempt_of(job).update(heartbeat_at=timezone.now()):
+                    return
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f'job-heartbeat-{job.pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def backoff(attempts):
+    delay = min(settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def run(job):
+    """
+    Runs a claimed job and records its result, or schedules its retry. Returns the new status,
+    or None when the job was claimed again meanwhile and the outcome was dropped.
+    """
+    try:
+        with heartbeat(job):
+            result = handlers[job.name](job, **job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            fields = {'status': Job.Status.QUEUED, 'run_at': timezone.now() + backoff(job.attempts)}
+        else:
+            fields = {'status': Job.Status.FAILED, 'finished_at': timezone.now()}
+        recorded = attempt_of(job).update(error=error, **fields)
+        return fields['status'] if recorded else None
+
+    recorded = attempt_of(job).update(
+        status=Job.Status.DONE, result=result, progress=1, error='', finished_at=timezone.now(),
+    )
+    return Job.Status.DONE if recorded else None
@@ -0,0 +1,13 @@
+handlers = {}
+
+
+def handler(name):
+    """
+    Registers a function as the handler of the jobs with this name. It is called with
+    the job and the keyword arguments of its payload, may call job_progress(job, ...)
+    and returns a JSON-serializable result.
+    """
+    def register(function):
+        handlers[name] = function
+        return function
+    return register
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from jobs.models import Job
+from jobs.registry import handlers
+
+
+class JobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'payload', 'status', 'attempts', 'max_attempts', 'run_at', 'progress',
+            'progress_message', 'result', 'error', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = [
+            'status', 'attempts', 'progress', 'progress_message', 'result', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
+
+    def validate_name(self, value):
+        if value not in handlers:
+            raise serializers.ValidationError(f'Unknown job, expected one of: {", ".join(sorted(handlers))}.')
+        return value
@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim, heartbeat, run, schedule
+
+
+def stale_job(attempts, max_attempts=3):
+    stopped = timezone.now() - timedelta(hours=1)
+    return Job.objects.create(
+        name='regrade_exam', payload={'exam_id': 1}, status=Job.Status.RUNNING,
+        attempts=attempts, max_attempts=max_attempts, started_at=stopped, heartbeat_at=stopped,
+    )
+
+
+class ClaimTests(TestCase):
+    def test_stale_job_is_claimed_again(self):
+        job = stale_job(attempts=1)
+
+        claimed = claim('worker')
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertEqual(claimed.worker, 'worker')
+
+    def test_stale_job_without_attempts_left_fails(self):
+        job = stale_job(attempts=3)
+
+        self.assertIsNone(claim('worker'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_running_job_with_fresh_heartbeat_is_not_claimed(self):
+        Job.objects.create(name='regrade_exam', status=Job.Status.RUNNING, attempts=1, heartbeat_at=timezone.now())
+        self.assertIsNone(claim('worker'))
+
+
+class RunTests(TestCase):
+    def test_outcome_of_a_reclaimed_attempt_is_dropped(self):
+        job = stale_job(attempts=1)
+        mine = claim('worker-a')
+        Job.objects.filter(pk=job.pk).update(worker='worker-b', attempts=F('attempts') + 1)
+        mine.name, mine.payload = 'rebuild_statistics', {}
+
+        self.assertIsNone(run(mine))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.attempts), (Job.Status.RUNNING, 'worker-b', 3))
+
+
+class ScheduleTests(TestCase):
+    def test_recurring_job_keeps_a_single_row(self):
+        self.assertTrue(schedule('flush_autosaves', 30))
+        self.assertFalse(schedule('flush_autosaves', 30))
+        job = Job.objects.get(name='flush_autosaves')
+
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.DONE)
+        self.assertTrue(schedule('flush_autosaves', 30))
+        self.assertEqual(list(Job.objects.values_list('pk', 'status')), [(job.pk, Job.Status.QUEUED)])
+
+    def test_second_recurring_row_is_refused(self):
+        schedule('flush_autosaves', 30)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(name='flush_autosaves', recurring=True)
+
+
+class HeartbeatTests(TransactionTestCase):
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeat_is_refreshed_while_the_handler_runs(self):
+        job = stale_job(attempts=1)
+        stopped = job.heartbeat_at
+
+        with heartbeat(job):
+            time.sleep(0.1)
+
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, stopped + timedelta(minutes=59))
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeat_stops_once_the_job_is_claimed_again(self):
+        job = stale_job(attempts=1)
+        Job.objects.filter(pk=job.pk).update(attempts=2, worker='other')
+
+        with heartbeat(job):
+            time.sleep(0.1)
+
+        self.assertEqual(Job.objects.get(pk=job.pk).heartbeat_at, job.heartbeat_at)
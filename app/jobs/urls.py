@@ -0,0 +1,9 @@
+from django.urls import path
+
+from jobs.views import JobDetailView, JobDownloadView, JobListView
+
+urlpatterns = [
+    path('jobs/', JobListView.as_view(), name='job-list'),
+    path('jobs/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/download/', JobDownloadView.as_view(), name='job-download'),
+]
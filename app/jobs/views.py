@@ -0,0 +1,36 @@
+from django.http import FileResponse, Http404
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+
+class JobListView(generics.ListCreateAPIView):
+    """
+    Lists the jobs, newest first, or enqueues one: {"name": "regrade_exam", "payload": {"exam_id": 1}}
+    """
+    queryset = Job.objects.order_by('-id')
+    serializer_class = JobSerializer
+    permission_classes = [IsAdminUser]
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAdminUser]
+
+
+class JobDownloadView(generics.GenericAPIView):
+    queryset = Job.objects.filter(status=Job.Status.DONE)
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        job = self.get_object()
+        path = (job.result or {}).get('path')
+        if not path:
+            raise Http404
+        try:
+            return FileResponse(open(path, 'rb'), as_attachment=True)
+        except FileNotFoundError:
+            raise Http404
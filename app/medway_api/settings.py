@@ -19,11 +19,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
+# DJANGO_ENV=production selects the production profile: no debug (so queries are not
+# kept in memory), persistent health-checked database connections and a real server
+# started by entrypoint.sh.
+PRODUCTION = os.environ.get("DJANGO_ENV", "development") == "production"
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-x95(-4u6g#ewh23@v7%wvz_(=ml^w64-iu&k#6*aw4-8%c=9z^"
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY", "django-insecure-x95(-4u6g#ewh23@v7%wvz_(=ml^w64-iu&k#6*aw4-8%c=9z^"
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DJANGO_DEBUG", "0" if PRODUCTION else "1") == "1"
 
 ALLOWED_HOSTS = ['*']
 
@@ -37,15 +44,22 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_filters",
     "student",
     "question",
     "exam",
-    "utils"
+    "attempt",
+    "analytics",
+    "jobs.apps.JobsConfig",
+    "utils.apps.UtilsConfig",
 ]
 
 MIDDLEWARE = [
+    "utils.middleware.MetricsMiddleware",
+    "utils.middleware.AdmissionControlMiddleware",
+    "utils.middleware.PrimaryPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -87,8 +101,99 @@ DATABASES = {
         'PASSWORD': os.environ.get("POSTGRES_PASSWORD"),
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get("POSTGRES_PORT", "5432"),
+        # Each worker thread keeps its connection open between requests instead of
+        # reconnecting every time, and checks it is still alive before reusing it.
+        # Under ASGI connections are not tied to a long-lived thread, so they are not kept.
+        'CONN_MAX_AGE': int(os.environ.get(
+            "POSTGRES_CONN_MAX_AGE",
+            "600" if PRODUCTION and os.environ.get("SERVER_MODE") != "asgi" else "0",
+        )),
+        'CONN_HEALTH_CHECKS': PRODUCTION,
+    }
+}
+
+# DATABASE_ENGINE=sqlite swaps Postgres for a local SQLite file, a stand-in for running
+# the benchmark suite without a database server. Postgres-only features (COPY, full-text
+# indexes) fall back to portable equivalents there.
+if os.environ.get("DATABASE_ENGINE") == "sqlite":
+    DATABASES = {
+        "default": {
+            'ENGINE': "django.db.backends.sqlite3",
+            'NAME': os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        }
+    }
+
+# Optional read replicas, comma separated in DATABASE_REPLICAS: "host[:port][/name]" on
+# Postgres, file paths with DATABASE_ENGINE=sqlite. ReplicaRouter sends reads of
+# REPLICA_READ_MODELS to them; attempts, students and jobs always use the primary.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.environ.get("DATABASE_REPLICAS", "").split(",")), start=1):
+    replica = replica.strip()
+    database = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        database["NAME"] = replica
+    else:
+        address, _, name = replica.partition("/")
+        host, _, port = address.partition(":")
+        database.update(HOST=host, PORT=port or database["PORT"], NAME=name or database["NAME"])
+    DATABASES[f"replica_{index}"] = database
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["utils.routers.ReplicaRouter"]
+REPLICA_READ_MODELS = ("exam.exam", "exam.examquestion", "question.question", "question.alternative", "analytics")
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# The caches in SHARED_CACHE_ALIASES hold state every process must agree on (exam payload
+# versions, autosave buffers, token revocations), so production refuses to start with them in local memory
+# (see utils/checks.py). Setting REDIS_URL makes all of them use Redis; each one can also
+# be pointed elsewhere with its <NAME>_CACHE_BACKEND and <NAME>_CACHE_LOCATION.
+LOCAL_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+REDIS_URL = os.environ.get("REDIS_URL")
+SHARED_CACHE_BACKEND = "django.core.cache.backends.redis.RedisCache" if REDIS_URL else LOCAL_CACHE_BACKEND
+
+
+def shared_cache(name, timeout=300, local_options=None):
+    backend = os.environ.get(f"{name}_CACHE_BACKEND", SHARED_CACHE_BACKEND)
+    location = REDIS_URL if REDIS_URL and backend == SHARED_CACHE_BACKEND else name.lower()
+    cache = {
+        "BACKEND": backend,
+        "LOCATION": os.environ.get(f"{name}_CACHE_LOCATION", location),
+        "KEY_PREFIX": name.lower(),
+        "TIMEOUT": timeout,
     }
+    if backend == LOCAL_CACHE_BACKEND and local_options:
+        cache["OPTIONS"] = local_options
+    return cache
+
+
+EXAM_CACHE = shared_cache("EXAM")
+# Exam payloads are versioned (see utils/cache.py), so a shared cache can keep them for a
+# day. A local one cannot see the versions bumped by other processes, so its entries expire
+# after a minute to bound how long a process serves an exam that changed elsewhere.
+EXAM_CACHE["TIMEOUT"] = int(os.environ.get(
+    "EXAM_CACHE_TIMEOUT", "60" if EXAM_CACHE["BACKEND"] == LOCAL_CACHE_BACKEND else str(24 * 60 * 60),
+))
+
+CACHES = {
+    "default": {
+        "BACKEND": LOCAL_CACHE_BACKEND,
+    },
+    "exams": EXAM_CACHE,
+    "autosave": shared_cache("AUTOSAVE", local_options={"MAX_ENTRIES": 100000}),
+    "tokens": shared_cache("TOKEN", local_options={"MAX_ENTRIES": 100000}),
 }
+SHARED_CACHE_ALIASES = ("exams", "autosave", "tokens")
+
+EXAM_CACHE_ALIAS = "exams"
+
+# Autosaved answers are buffered in this cache and written to the database at most once
+# per AUTOSAVE_FLUSH_INTERVAL seconds per attempt, and by the flush_autosaves job at that
+# interval (see attempt/autosave.py). The job needs a shared cache to see the buffers.
+AUTOSAVE_CACHE_ALIAS = "autosave"
+AUTOSAVE_FLUSH_INTERVAL = int(os.environ.get("AUTOSAVE_FLUSH_INTERVAL", "30"))
+AUTOSAVE_BUFFER_TTL = int(os.environ.get("AUTOSAVE_BUFFER_TTL", str(6 * 60 * 60)))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -132,13 +237,82 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'student.authentication.SignedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
+    # orjson-backed JSON; swap for rest_framework.renderers.JSONRenderer and
+    # rest_framework.parsers.JSONParser to go back to the standard library encoder.
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'utils.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
     "DEFAULT_PAGINATION_CLASS": ("rest_framework.pagination.PageNumberPagination"),
     "PAGE_SIZE": 30,
     'DEFAULT_VERSION': 'v1',
+    # Token buckets per student ("student") and per endpoint ("throttle_scope" of the views),
+    # see utils/throttling.py. THROTTLE_BACKEND may be utils.throttling.CacheBucketStore to
+    # share them between processes through THROTTLE_CACHE_ALIAS.
+    'DEFAULT_THROTTLE_CLASSES': (
+        'utils.throttling.StudentRateThrottle',
+        'utils.throttling.ScopedBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'student': os.environ.get("THROTTLE_STUDENT_RATE", "120/min"),
+        'auth': os.environ.get("THROTTLE_AUTH_RATE", "20/min"),
+        'exam-delivery': os.environ.get("THROTTLE_EXAM_DELIVERY_RATE", "10/min"),
+        'submission': os.environ.get("THROTTLE_SUBMISSION_RATE", "10/min"),
+        'autosave': os.environ.get("THROTTLE_AUTOSAVE_RATE", "60/min"),
+    },
+    'THROTTLE_BACKEND': os.environ.get("THROTTLE_BACKEND", "utils.throttling.LocalBucketStore"),
+    'THROTTLE_CACHE_ALIAS': "default",
+    # Requests running at once per process under PATH_PREFIXES, with up to QUEUE_SIZE more
+    # waiting QUEUE_TIMEOUT seconds for a slot (utils.middleware.AdmissionControlMiddleware).
+    # 0 disables the limit.
+    'ADMISSION_CONTROL': {
+        'MAX_CONCURRENT_REQUESTS': int(os.environ.get("ADMISSION_MAX_CONCURRENT_REQUESTS", "64")),
+        'QUEUE_SIZE': int(os.environ.get("ADMISSION_QUEUE_SIZE", "128")),
+        'QUEUE_TIMEOUT': float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "1.0")),
+        'PATH_PREFIXES': ('/api/',),
+    },
 }
 
 AUTH_USER_MODEL = 'student.Student'
 
+# Signed student tokens (see student/tokens.py), in seconds. Revocations and used refresh
+# tokens are shared through TOKEN_CACHE_ALIAS, and revocations are cached by each process for
+# TOKEN_REVOCATION_TTL seconds.
+TOKEN_ACCESS_LIFETIME = int(os.environ.get("TOKEN_ACCESS_LIFETIME", "300"))
+TOKEN_REFRESH_LIFETIME = int(os.environ.get("TOKEN_REFRESH_LIFETIME", str(7 * 24 * 60 * 60)))
+TOKEN_REVOCATION_TTL = int(os.environ.get("TOKEN_REVOCATION_TTL", "5"))
+TOKEN_CACHE_ALIAS = "tokens"
+
+# Background jobs (see jobs/queue.py), in seconds. Exports built by jobs are written to
+# JOB_EXPORT_ROOT.
+JOB_STALE_AFTER = int(os.environ.get("JOB_STALE_AFTER", "600"))
+JOB_HEARTBEAT_INTERVAL = int(os.environ.get("JOB_HEARTBEAT_INTERVAL", "60"))
+JOB_RETRY_BASE_DELAY = int(os.environ.get("JOB_RETRY_BASE_DELAY", "30"))
+JOB_RETRY_MAX_DELAY = int(os.environ.get("JOB_RETRY_MAX_DELAY", "3600"))
+JOB_EXPORT_ROOT = os.environ.get("JOB_EXPORT_ROOT", BASE_DIR / "exports")
+# Jobs that run_jobs keeps enqueued, each one every so many seconds.
+JOB_SCHEDULE = {
+    "flush_autosaves": AUTOSAVE_FLUSH_INTERVAL,
+}
+
+# Request metrics served at /metrics/ in the Prometheus format. Lower the sample rate to
+# measure only a share of the requests; requests above the query threshold are logged.
+# Scrapes are accepted from the allowed IPs or with "Authorization: Bearer <METRICS_TOKEN>".
+# Each process keeps its own metrics, and a scrape only sees the process that served it.
+METRICS_ALLOWED_IPS = [ip for ip in os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip]
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+METRICS_SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", "1.0"))
+METRICS_QUERY_THRESHOLD = int(os.environ.get("METRICS_QUERY_THRESHOLD", "50"))
+
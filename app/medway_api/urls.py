@@ -15,8 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from utils.views import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics/", metrics, name="metrics"),
+    path("api/", include("student.urls")),
+    path("api/", include("question.urls")),
+    path("api/", include("exam.urls")),
+    path("api/", include("attempt.urls")),
+    path("api/", include("analytics.urls")),
+    path("api/", include("jobs.urls")),
+    path("api/", include("utils.urls")),
 ]
@@ -1,6 +1,10 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
 
+from exam.snapshot import exam_ids_for_question, rebuild_exam_payload
+from question.dedup import content_hash, refresh_content_hashes
 from question.models import Question, Alternative
+from question.search import search_questions
 
 
 class AlternativeInline(admin.TabularInline):
@@ -13,3 +17,46 @@ class AlternativeInline(admin.TabularInline):
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
     inlines = [AlternativeInline]
+    list_display = ('id', '__str__')
+    ordering = ('-id',)
+    search_fields = ('content',)
+    list_per_page = 50
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_questions(queryset, search_term), False
+
+    def save_related(self, request, form, formsets, change):
+        if not change:
+            duplicate = self.find_duplicate(form, formsets)
+            if duplicate is not None:
+                # Reuse the identical question instead of keeping a second copy of it.
+                form.instance.delete()
+                form.instance.pk = duplicate.pk
+                form.instance.refresh_from_db()
+                for formset in formsets:
+                    formset.new_objects, formset.changed_objects, formset.deleted_objects = [], [], []
+                self.message_user(request, 'An identical question already exists and was reused.', messages.WARNING)
+                return
+
+        super().save_related(request, form, formsets, change)
+        refresh_content_hashes([form.instance.pk])
+        exam_ids = list(exam_ids_for_question(form.instance.pk))
+
+        def rebuild():
+            for exam_id in exam_ids:
+                rebuild_exam_payload(exam_id)
+
+        transaction.on_commit(rebuild)
+
+    def find_duplicate(self, form, formsets):
+        alternatives = [
+            (data['option'], data['content'], data['is_correct'])
+            for formset in formsets
+            for data in formset.cleaned_data
+            if data and not data.get('DELETE')
+        ]
+        hash_ = content_hash(form.cleaned_data['content'], alternatives)
+        return Question.objects.filter(content_hash=hash_).exclude(pk=form.instance.pk).order_by('pk').first()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from question.models import Question, Alternative
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def content_hash(content, alternatives):
+    """
+    Hashes the normalized content of a question together with its alternatives, given as
+    (option, content, is_correct) tuples. Case, spacing and unicode forms are ignored.
+    """
+    payload = [
+        normalize(content),
+        sorted([option, normalize(alternative), is_correct] for option, alternative, is_correct in alternatives),
+    ]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+
+def question_hash(question_data):
+    """
+    Hash of a question shaped like the ones of the 0002_create_exams migration.
+    """
+    return content_hash(question_data['content'], [
+        (alternative_data['alternative'], alternative_data['content'], alternative_data['is_correct'])
+        for alternative_data in question_data['alternatives']
+    ])
+
+
+def existing_questions(hashes):
+    """
+    Maps the given hashes to the oldest question that already has them.
+    """
+    existing = {}
+    rows = (
+        Question.objects
+        .filter(content_hash__in=set(hashes))
+        .order_by('-id')
+        .values_list('content_hash', 'id')
+    )
+    for hash_, question_id in rows:
+        existing[hash_] = question_id
+    return existing
+
+
+def refresh_content_hashes(question_ids):
+    """
+    Recomputes the stored hash of the given questions from their current alternatives.
+    """
+    alternatives = {question_id: [] for question_id in question_ids}
+    rows = (
+        Alternative.objects
+        .filter(question_id__in=question_ids)
+        .values_list('question_id', 'option', 'content', 'is_correct')
+    )
+    for question_id, option, content, is_correct in rows:
+        alternatives[question_id].append((option, content, is_correct))
+
+    questions = list(Question.objects.filter(pk__in=question_ids).only('id', 'content'))
+    for question in questions:
+        question.content_hash = content_hash(question.content, alternatives[question.pk])
+    Question.objects.bulk_update(questions, ['content_hash'], batch_size=1000)
+    return questions
+
+
+def duplicate_hashes(batch_size=1000):
+    """
+    Yields batches of hashes shared by more than one question, walking the hash index
+    in order so that only one batch is held in memory.
+    """
+    last = ''
+    while True:
+        batch = list(
+            Question.objects
+            .filter(content_hash__gt=last)
+            .values('content_hash')
+            .annotate(count=Count('id'))
+            .filter(count__gt=1)
+            .order_by('content_hash')
+            .values_list('content_hash', flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+def merge_duplicates(hashes):
+    """
+    Keeps the oldest question of each hash, moves the exam questions and answers of the
+    others to it and deletes them. Returns the kept ids, the deleted ids and the exams touched.
+    """
+    question_table = Question._meta.db_table
+    alternative_table = Alternative._meta.db_table
+    # Imported here because the exam, attempt and analytics apps depend on this one.
+    from analytics.models import QuestionStatistics
+    from attempt.models import Answer
+    from exam.models import ExamQuestion
+    exam_question_table = ExamQuestion._meta.db_table
+    answer_table = Answer._meta.db_table
+    statistics_table = QuestionStatistics._meta.db_table
+
+    placeholders = ', '.join(['%s'] * len(hashes))
+    duplicates = (
+        f'SELECT id, keep_id FROM (SELECT id, MIN(id) OVER (PARTITION BY content_hash) AS keep_id '
+        f'FROM {question_table} WHERE content_hash IN ({placeholders})) AS grouped WHERE id <> keep_id'
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(duplicates, hashes)
+        mapping = dict(cursor.fetchall())
+        cursor.execute(
+            f'SELECT DISTINCT exam_id FROM {exam_question_table} WHERE question_id IN (SELECT id FROM ({duplicates}) AS d)',
+            hashes,
+        )
+        exam_ids = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(
+            f'UPDATE {answer_table} SET alternative_id = kept.id '
+            f'FROM {alternative_table} AS old, ({duplicates}) AS d, {alternative_table} AS kept '
+            f'WHERE {answer_table}.alternative_id = old.id AND old.question_id = d.id '
+            f'AND kept.question_id = d.keep_id AND kept.option = old.option',
+            hashes,
+        )
+        cursor.execute(
+            f'UPDATE {exam_question_table} SET question_id = d.keep_id FROM ({duplicates}) AS d '
+            f'WHERE {exam_question_table}.question_id = d.id',
+            hashes,
+        )
+        # Nothing points at the duplicates anymore, so they are deleted with plain SQL
+        # instead of the collector, whose per-row signals would touch each exam again;
+        # the caller invalidates and touches the exams once.
+        for table, column in ((statistics_table, 'question_id'), (alternative_table, 'question_id'), (question_table, 'id')):
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN (SELECT id FROM ({duplicates}) AS d)', hashes)
+
+    return sorted(set(mapping.values())), sorted(mapping), exam_ids
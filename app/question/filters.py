@@ -0,0 +1,15 @@
+import django_filters
+
+from question.models import Question
+from question.search import search_questions
+
+
+class QuestionFilter(django_filters.FilterSet):
+    search = django_filters.CharFilter(method='filter_search')
+
+    class Meta:
+        model = Question
+        fields = ['search']
+
+    def filter_search(self, queryset, name, value):
+        return search_questions(queryset, value)
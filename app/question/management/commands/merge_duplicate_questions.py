@@ -0,0 +1,53 @@
+import time
+
+from django.core.management import BaseCommand
+
+from analytics.statistics import rebuild_statistics
+from exam.snapshot import invalidate_exams, touch_exams
+from question.dedup import duplicate_hashes, merge_duplicates, refresh_content_hashes
+from question.models import Question
+
+
+class Command(BaseCommand):
+    """
+    Command that merges questions with the same content hash into the oldest of them,
+    moving their exam questions and answers along. Duplicates are processed in batches of
+    hashes, each in its own transaction, and questions without a hash get one first.
+
+    The payloads of the touched exams are invalidated through the versioned exam cache,
+    which only reaches the web processes when that cache is shared. With a local-memory
+    cache they keep serving the deleted questions until their entries expire
+    (EXAM_CACHE_TIMEOUT), so in production the command, like every other one, refuses to
+    run until the cache is shared (check utils.E001).
+
+    You can call it by terminal like this:
+    -> "python manage.py merge_duplicate_questions --batch-size 1000"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Hashes merged per transaction.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.monotonic()
+
+        hashed = 0
+        while True:
+            question_ids = list(Question.objects.filter(content_hash='').values_list('pk', flat=True)[:batch_size])
+            if not question_ids:
+                break
+            hashed += len(refresh_content_hashes(question_ids))
+        if hashed:
+            self.stdout.write(f'Hashed {hashed} questions.')
+
+        merged = 0
+        for hashes in duplicate_hashes(batch_size):
+            kept_ids, deleted_ids, exam_ids = merge_duplicates(hashes)
+            rebuild_statistics(kept_ids)
+            invalidate_exams(exam_ids)
+            touch_exams(exam_ids)
+            merged += len(deleted_ids)
+            self.stdout.write(f'Merged {len(deleted_ids)} duplicates into {len(kept_ids)} questions.')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Removed {merged} duplicate questions in {elapsed:.2f}s.'))
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alternative',
+            index=models.Index(fields=['question', 'option'], name='question_al_questio_2b9e93_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:56
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+search_indexes = [
+    ('alternative', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('content', config='portuguese'), name='alternative_content_search')),
+    ('question', django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('content', config='portuguese'), name='question_content_search')),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN full-text indexes only exist on Postgres; other backends search with icontains.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in search_indexes:
+        schema_editor.add_index(apps.get_model('question', model_name), index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in search_indexes:
+        schema_editor.remove_index(apps.get_model('question', model_name), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0002_alternative_question_option_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name=model_name, index=index)
+                for model_name, index in search_indexes
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_indexes, reverse_code=drop_search_indexes),
+            ],
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:12
+
+import hashlib
+import json
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Frozen copies of question.dedup.normalize and content_hash as of this migration, so later
+# changes to the hash never change what this migration stores.
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def content_hash(content, alternatives):
+    payload = [
+        normalize(content),
+        sorted([option, normalize(alternative), is_correct] for option, alternative, is_correct in alternatives),
+    ]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode()).hexdigest()
+
+
+def content_hash_field():
+    field = models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64)
+    field.set_attributes_from_name('content_hash')
+    return field
+
+
+def add_content_hash(apps, schema_editor):
+    Question = apps.get_model('question', 'Question')
+    field = content_hash_field()
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_field(Question, field)
+        return
+    # Other backends rebuild the table to add a NOT NULL column, which would recreate the
+    # Postgres-only search indexes of the model state, so the column is added in place.
+    table = schema_editor.quote_name(Question._meta.db_table)
+    schema_editor.execute(f"ALTER TABLE {table} ADD COLUMN content_hash varchar(64) NOT NULL DEFAULT ''")
+    schema_editor.execute(schema_editor._create_index_sql(Question, fields=[field]))
+
+
+def remove_content_hash(apps, schema_editor):
+    Question = apps.get_model('question', 'Question')
+    schema_editor.remove_field(Question, Question._meta.get_field('content_hash'))
+
+
+def fill_content_hashes(apps, schema_editor):
+    Question = apps.get_model('question', 'Question')
+    Alternative = apps.get_model('question', 'Alternative')
+
+    questions = Question.objects.filter(content_hash='').order_by('id')
+    last_id = 0
+    while True:
+        batch = list(questions.filter(id__gt=last_id).only('id', 'content')[:1000])
+        if not batch:
+            return
+        alternatives = {question.id: [] for question in batch}
+        for question_id, option, content, is_correct in (
+            Alternative.objects
+            .filter(question_id__in=alternatives)
+            .values_list('question_id', 'option', 'content', 'is_correct')
+        ):
+            alternatives[question_id].append((option, content, is_correct))
+        for question in batch:
+            question.content_hash = content_hash(question.content, alternatives[question.id])
+        Question.objects.bulk_update(batch, ['content_hash'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0003_content_search_indexes'),
+        # The seeded questions need a hash too.
+        ('exam', '0002_create_exams'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(model_name='question', name='content_hash', field=content_hash_field()),
+            ],
+            database_operations=[
+                migrations.RunPython(add_content_hash, reverse_code=remove_content_hash),
+            ],
+        ),
+        migrations.RunPython(fill_content_hashes, reverse_code=migrations.RunPython.noop),
+    ]
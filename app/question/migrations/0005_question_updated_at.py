@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+def updated_at_field():
+    field = models.DateTimeField(auto_now=True)
+    field.set_attributes_from_name('updated_at')
+    return field
+
+
+def add_updated_at(apps, schema_editor):
+    Question = apps.get_model('question', 'Question')
+    field = updated_at_field()
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_field(Question, field)
+        return
+    # As in 0004_question_content_hash: added in place so the table is not rebuilt with the
+    # Postgres-only search indexes. Existing rows get the current time.
+    table = schema_editor.quote_name(Question._meta.db_table)
+    default = schema_editor.quote_value(schema_editor.effective_default(field))
+    db_type = field.db_type(schema_editor.connection)
+    schema_editor.execute(f'ALTER TABLE {table} ADD COLUMN updated_at {db_type} NOT NULL DEFAULT {default}')
+
+
+def remove_updated_at(apps, schema_editor):
+    Question = apps.get_model('question', 'Question')
+    schema_editor.remove_field(Question, Question._meta.get_field('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('question', '0004_question_content_hash'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(model_name='question', name='updated_at', field=updated_at_field()),
+            ],
+            database_operations=[
+                migrations.RunPython(add_updated_at, reverse_code=remove_updated_at),
+            ],
+        ),
+    ]
@@ -1,13 +1,24 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.utils.text import Truncator
 
 from question.utils import AlternativesChoices
 
 
 class Question(models.Model):
     content = models.TextField()
+    content_hash = models.CharField(max_length=64, blank=True, default='', editable=False, db_index=True)
+    # Bumped by exam/signals.py when the alternatives change too.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(SearchVector('content', config='portuguese'), name='question_content_search'),
+        ]
 
     def __str__(self):
-        return self.content
+        return Truncator(self.content).chars(80)
 
 
 class Alternative(models.Model):
@@ -15,3 +26,12 @@ class Alternative(models.Model):
     content = models.TextField()
     option = models.IntegerField(choices=AlternativesChoices)
     is_correct = models.BooleanField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'option']),
+            GinIndex(SearchVector('content', config='portuguese'), name='alternative_content_search'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_option_display()}) {Truncator(self.content).chars(80)}'
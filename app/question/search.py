@@ -0,0 +1,34 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+
+from question.models import Alternative, Question
+
+SEARCH_CONFIG = 'portuguese'
+
+
+def content_vector():
+    # Must stay identical to the expression of the GIN indexes on Question and Alternative.
+    return SearchVector('content', config=SEARCH_CONFIG)
+
+
+def search_questions(queryset, text):
+    """
+    Filters questions whose content, or the content of one of their alternatives,
+    matches a web-style search and orders them by rank.
+    """
+    if connection.vendor != 'postgresql':
+        matching_alternatives = Alternative.objects.filter(question=OuterRef('pk'), content__icontains=text)
+        return queryset.filter(Q(content__icontains=text) | Exists(matching_alternatives))
+
+    # Each side of the union is answered by its own GIN index; an OR of the two
+    # conditions on the question row would compute the vector of every question instead.
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    matching_questions = Question.objects.alias(search=content_vector()).filter(search=query).values('id')
+    matching_alternatives = Alternative.objects.alias(search=content_vector()).filter(search=query).values('question_id')
+    return (
+        queryset
+        .filter(pk__in=matching_questions.union(matching_alternatives))
+        .annotate(rank=SearchRank(content_vector(), query))
+        .order_by('-rank', 'id')
+    )
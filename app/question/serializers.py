@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from question.models import Question, Alternative
+
+
+class AlternativeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Alternative
+        fields = ('id', 'option', 'content')
+
+
+class QuestionSerializer(serializers.ModelSerializer):
+    alternatives = AlternativeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ('id', 'content', 'alternatives')
+
+
+class BankAlternativeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Alternative
+        fields = ('id', 'option', 'content', 'is_correct')
+
+
+class BankQuestionSerializer(serializers.ModelSerializer):
+    alternatives = BankAlternativeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ('id', 'content', 'alternatives')
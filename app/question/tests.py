@@ -0,0 +1,36 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from question.models import Question
+from student.models import Student
+
+
+class ConditionalQuestionListTests(TestCase):
+    url = '/api/questions/?pagination=keyset'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(Student.objects.create(username='admin', email='admin@medway.com', is_staff=True))
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        # The page query and the alternatives prefetch, with no count or aggregate.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_row_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        question = Question.objects.order_by('id').first()
+        question.content += ' (revisada)'
+        question.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_search_is_refused_with_keyset_pagination(self):
+        response = self.client.get(f'{self.url}&search=dor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('search', response.json())
+        self.assertEqual(self.client.get('/api/questions/', {'search': 'dor'}).status_code, 200)
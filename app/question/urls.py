@@ -0,0 +1,7 @@
+from django.urls import path
+
+from question.views import QuestionListView
+
+urlpatterns = [
+    path('questions/', QuestionListView.as_view(), name='question-list'),
+]
@@ -0,0 +1,24 @@
+from django.db.models import Prefetch
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+
+from question.filters import QuestionFilter
+from question.models import Question, Alternative
+from question.serializers import BankQuestionSerializer
+from utils.conditional import ConditionalListMixin
+from utils.pagination import SelectablePagination
+
+
+class QuestionListView(ConditionalListMixin, generics.ListAPIView):
+    serializer_class = BankQuestionSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = SelectablePagination
+    keyset_ordering = ('id',)
+    # A search orders by rank, which keyset pages would replace by id.
+    keyset_excluded_params = ('search',)
+    filterset_class = QuestionFilter
+
+    def get_queryset(self):
+        return Question.objects.order_by('id').prefetch_related(
+            Prefetch('alternatives', queryset=Alternative.objects.order_by('option'))
+        )
@@ -5,4 +5,8 @@ from student.models import Student
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
-    pass
\ No newline at end of file
+    list_display = ('email', 'name', 'username', 'is_staff')
+    list_filter = ('is_staff', 'is_active')
+    search_fields = ('email', 'name', 'username')
+    list_per_page = 50
+    show_full_result_count = False
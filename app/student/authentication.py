@@ -0,0 +1,75 @@
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication, CSRFCheck, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+
+from student.tokens import TokenError, access_student
+
+KEYWORD = b'bearer'
+
+
+def bearer_token(request):
+    header = get_authorization_header(request).split()
+    if not header or header[0].lower() != KEYWORD:
+        return None
+    if len(header) != 2:
+        raise AuthenticationFailed('Invalid Authorization header.')
+    return header[1].decode()
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates "Authorization: Bearer <access token>" requests from the token claims,
+    without any database query.
+    """
+
+    def authenticate(self, request):
+        token = bearer_token(request)
+        if token is None:
+            return None
+        try:
+            return access_student(token), token
+        except TokenError as error:
+            raise AuthenticationFailed(str(error))
+
+    def authenticate_header(self, request):
+        return 'Bearer'
+
+
+def enforce_csrf(request):
+    """
+    The CSRF check of DRF's SessionAuthentication, for csrf_exempt plain views.
+    """
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    reason = check.process_view(request, None, (), {})
+    if reason:
+        raise PermissionDenied(f'CSRF Failed: {reason}')
+
+
+async def aget_user(request):
+    """
+    User of a plain async view: the bearer token when there is one, the session otherwise.
+    Raises AuthenticationFailed for a malformed, expired or revoked token, and
+    PermissionDenied when a session request fails the CSRF check. Bearer tokens skip it, like
+    in the DRF views, so unsafe views using it are csrf_exempt.
+    """
+    token = bearer_token(request)
+    if token is not None:
+        try:
+            return access_student(token)
+        except TokenError as error:
+            raise AuthenticationFailed(str(error))
+    user = await request.auser()
+    if user.is_authenticated:
+        enforce_csrf(request)
+    return user
+
+
+def unauthenticated_response(detail=NotAuthenticated.default_detail):
+    """
+    The 401 SignedTokenAuthentication gets from DRF, for plain async views.
+    """
+    response = JsonResponse({'detail': str(detail)}, status=status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = 'Bearer'
+    return response
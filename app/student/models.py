@@ -5,6 +5,7 @@ from django.db import models
 class Student(AbstractUser):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
+    tokens_revoked_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.email
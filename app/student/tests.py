@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+
+from student.models import Student
+from student.tokens import TokenError, issue_tokens, refresh_tokens, revoke_tokens
+
+
+class AsyncAuthenticationTests(TestCase):
+    url = '/api/async/exams/999/'
+
+    def setUp(self):
+        self.student = Student.objects.create(username='aluno', email='aluno@medway.com')
+
+    def get(self, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        return self.client.get(self.url, headers=headers)
+
+    def assertUnauthenticated(self, response, detail):
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+        self.assertEqual(response.json(), {'detail': detail})
+
+    def test_valid_token_is_accepted(self):
+        self.assertEqual(self.get(issue_tokens(self.student)['access']).status_code, 404)
+
+    def test_invalid_token_is_rejected_like_the_sync_views(self):
+        self.assertUnauthenticated(self.get('not-a-token'), 'Invalid token.')
+
+    def test_revoked_token_is_rejected_like_the_sync_views(self):
+        token = issue_tokens(self.student)['access']
+        revoke_tokens(self.student)
+        self.assertUnauthenticated(self.get(token), 'Token revoked.')
+
+    def test_missing_credentials_are_rejected_like_the_sync_views(self):
+        self.assertUnauthenticated(self.get(), 'Authentication credentials were not provided.')
+
+
+class RefreshTokenTests(TestCase):
+    def setUp(self):
+        caches[settings.TOKEN_CACHE_ALIAS].clear()
+        self.student = Student.objects.create(username='aluno', email='aluno@medway.com')
+
+    def test_refresh_token_is_accepted_once(self):
+        refresh = issue_tokens(self.student)['refresh']
+        rotated = refresh_tokens(refresh)['refresh']
+
+        with self.assertRaisesMessage(TokenError, 'Token already used.'):
+            refresh_tokens(refresh)
+        self.assertIn('access', refresh_tokens(rotated))
+
+    def test_revoked_refresh_token_is_rejected(self):
+        refresh = issue_tokens(self.student)['refresh']
+        revoke_tokens(self.student)
+        with self.assertRaisesMessage(TokenError, 'Token revoked.'):
+            refresh_tokens(refresh)
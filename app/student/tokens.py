@@ -0,0 +1,153 @@
+"""
+Signed, stateless tokens for students.
+
+Access tokens carry the claims the API needs (id, username, staff flags), so requests
+authenticated with them rebuild the student without touching the database. They live for
+TOKEN_ACCESS_LIFETIME seconds. Refresh tokens live longer, are checked against the
+database when exchanged for a new pair and can be exchanged only once: their id is
+recorded in the TOKEN_CACHE_ALIAS cache until they expire.
+
+Revoking sets Student.tokens_revoked_at and publishes the same instant in the
+TOKEN_CACHE_ALIAS cache for as long as an access token can live. Other processes only see
+it when that cache is shared between them, which production requires (check utils.E001).
+Each process keeps the instants it read for TOKEN_REVOCATION_TTL seconds, so other
+processes may accept a revoked access token for that long. A revocation or used refresh
+token evicted from the cache early is forgotten.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.utils import timezone
+
+from student.models import Student
+
+ACCESS_SALT = 'student.tokens.access'
+REFRESH_SALT = 'student.tokens.refresh'
+
+
+class TokenError(Exception):
+    pass
+
+
+class RevocationCache:
+    """
+    Per-process cache, in front of the shared cache, of the instant before which the
+    tokens of a student are revoked (0 when they are not).
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def key(self, student_id):
+        return f'student:tokens-revoked:{student_id}'
+
+    def revoked_before(self, student_id):
+        now = time.monotonic()
+        entry = self.entries.get(student_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        revoked_before = caches[settings.TOKEN_CACHE_ALIAS].get(self.key(student_id), 0)
+        self.remember(student_id, revoked_before, now)
+        return revoked_before
+
+    def revoke(self, student_id, revoked_before):
+        caches[settings.TOKEN_CACHE_ALIAS].set(self.key(student_id), revoked_before, settings.TOKEN_ACCESS_LIFETIME)
+        self.remember(student_id, revoked_before, time.monotonic())
+
+    def remember(self, student_id, revoked_before, now):
+        with self.lock:
+            if len(self.entries) >= self.max_entries:
+                self.entries = {key: entry for key, entry in self.entries.items() if entry[1] > now}
+                if len(self.entries) >= self.max_entries:
+                    self.entries.clear()
+            self.entries[student_id] = (revoked_before, now + settings.TOKEN_REVOCATION_TTL)
+
+
+revocations = RevocationCache()
+
+
+def claims_for(student):
+    return {
+        'sub': student.pk,
+        'username': student.username,
+        'staff': student.is_staff,
+        'superuser': student.is_superuser,
+        'iat': time.time(),
+    }
+
+
+def issue_tokens(student):
+    claims = claims_for(student)
+    return {
+        'access': signing.dumps(claims, salt=ACCESS_SALT),
+        'refresh': signing.dumps({'sub': claims['sub'], 'iat': claims['iat'], 'jti': uuid.uuid4().hex}, salt=REFRESH_SALT),
+        'expires_in': settings.TOKEN_ACCESS_LIFETIME,
+    }
+
+
+def load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise TokenError('Token expired.')
+    except signing.BadSignature:
+        raise TokenError('Invalid token.')
+
+
+def access_student(token):
+    """
+    Returns an unsaved Student built from the claims of an access token.
+    """
+    claims = load(token, ACCESS_SALT, settings.TOKEN_ACCESS_LIFETIME)
+    if claims['iat'] <= revocations.revoked_before(claims['sub']):
+        raise TokenError('Token revoked.')
+
+    student = Student(
+        id=claims['sub'],
+        username=claims['username'],
+        is_staff=claims['staff'],
+        is_superuser=claims['superuser'],
+        is_active=True,
+    )
+    student._state.adding = False
+    student._state.db = 'default'
+    return student
+
+
+def refresh_used_key(claims):
+    return f'student:refresh-used:{claims["jti"]}'
+
+
+def refresh_tokens(token):
+    """
+    Exchanges a refresh token for a new pair, checking the student against the database.
+    Each refresh token is accepted once; the new pair replaces it.
+    """
+    claims = load(token, REFRESH_SALT, settings.TOKEN_REFRESH_LIFETIME)
+    if 'jti' not in claims:
+        raise TokenError('Invalid token.')
+    student = Student.objects.filter(pk=claims['sub'], is_active=True).first()
+    if student is None:
+        raise TokenError('Invalid token.')
+    if student.tokens_revoked_at and claims['iat'] <= student.tokens_revoked_at.timestamp():
+        raise TokenError('Token revoked.')
+    remaining = claims['iat'] + settings.TOKEN_REFRESH_LIFETIME - time.time()
+    if not caches[settings.TOKEN_CACHE_ALIAS].add(refresh_used_key(claims), 1, timeout=max(1, int(remaining) + 1)):
+        raise TokenError('Token already used.')
+    return issue_tokens(student)
+
+
+def revoke_tokens(student):
+    """
+    Revokes every token issued to a student until now.
+    """
+    now = timezone.now()
+    Student.objects.filter(pk=student.pk).update(tokens_revoked_at=now)
+    revocations.revoke(student.pk, now.timestamp())
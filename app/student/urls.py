@@ -0,0 +1,9 @@
+from django.urls import path
+
+from student.views import TokenObtainView, TokenRefreshView, TokenRevokeView
+
+urlpatterns = [
+    path('auth/token/', TokenObtainView.as_view(), name='token-obtain'),
+    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('auth/token/revoke/', TokenRevokeView.as_view(), name='token-revoke'),
+]
@@ -0,0 +1,48 @@
+from django.contrib.auth import authenticate
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from student.serializers import TokenObtainSerializer, TokenRefreshSerializer
+from student.tokens import TokenError, issue_tokens, refresh_tokens, revoke_tokens
+
+
+class PublicTokenView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_scope = 'auth'
+
+    def get_authenticate_header(self, request):
+        return 'Bearer'
+
+
+class TokenObtainView(PublicTokenView):
+
+    def post(self, request):
+        serializer = TokenObtainSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        student = authenticate(request, **serializer.validated_data)
+        if student is None:
+            raise AuthenticationFailed('Invalid username or password.')
+        return Response(issue_tokens(student))
+
+
+class TokenRefreshView(PublicTokenView):
+
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            return Response(refresh_tokens(serializer.validated_data['refresh']))
+        except TokenError as error:
+            raise AuthenticationFailed(str(error))
+
+
+class TokenRevokeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revoke_tokens(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
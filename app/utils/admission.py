@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+
+class ConcurrencyLimiter:
+    """
+    Lets at most "limit" requests run at once in the process. Up to "queue_size" more wait
+    at most "timeout" seconds for a slot; the rest are refused right away.
+    """
+
+    def __init__(self, limit, queue_size, timeout):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_size:
+                return False
+            self.waiting += 1
+            try:
+                admitted = self.condition.wait_for(lambda: self.active < self.limit, self.timeout)
+            finally:
+                self.waiting -= 1
+            if admitted:
+                self.active += 1
+            return admitted
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+
+class AsyncConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    ConcurrencyLimiter for ASGI, waiting on the event loop instead of blocking a thread.
+    """
+
+    def __init__(self, limit, queue_size, timeout):
+        super().__init__(limit, queue_size, timeout)
+        self.condition = None
+
+    async def acquire(self):
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+        async with self.condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_size:
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.condition.wait_for(lambda: self.active < self.limit), self.timeout)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            return True
+
+    async def release(self):
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def release_soon(self, loop):
+        """
+        Returns a plain callable releasing a slot on the given loop, for response closers,
+        which Django calls from a worker thread.
+        """
+        return lambda: asyncio.run_coroutine_threadsafe(self.release(), loop)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'utils'
+
+    def ready(self):
+        import utils.checks  # noqa: F401
+        import utils.signals  # noqa: F401
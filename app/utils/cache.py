@@ -0,0 +1,44 @@
+"""
+Versioned cache entries. Instead of deleting an entry when its source changes, a writer
+bumps a version number stored next to it, and readers look entries up under the current
+version. An entry built from data read before a change is stored under the old version
+and never served again, even if it is set after the bump, and the bump reaches every
+process that shares the cache.
+"""
+import time
+
+
+def version_key(name):
+    return f'version:{name}'
+
+
+def initial_version():
+    # Starts from the clock so a version evicted from the cache never comes back with a
+    # number whose entries are still cached.
+    return time.time_ns()
+
+
+def get_version(cache, name):
+    key = version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(cache, name):
+    key = version_key(name)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, initial_version(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_versions(cache, names):
+    for name in names:
+        try:
+            cache.incr(version_key(name))
+        except ValueError:
+            cache.add(version_key(name), initial_version(), timeout=None)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def shared_caches_check(app_configs, **kwargs):
+    """
+    In production several processes serve the API and run jobs, so the caches they
+    coordinate through must not live in the memory of each one.
+    """
+    if not settings.PRODUCTION:
+        return []
+    return [
+        Error(
+            f'The "{alias}" cache uses local memory, which is not shared between processes.',
+            hint='Set REDIS_URL, or the BACKEND and LOCATION of a shared cache for it.',
+            id='utils.E001',
+        )
+        for alias in settings.SHARED_CACHE_ALIASES
+        if settings.CACHES[alias]['BACKEND'] == settings.LOCAL_CACHE_BACKEND
+    ]
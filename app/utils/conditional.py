@@ -0,0 +1,82 @@
+import hashlib
+
+from django.db.models import F
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(':'.join(str(part) for part in parts).encode(), digest_size=16)
+    return quote_etag(digest.hexdigest())
+
+
+def set_validators(response, etag, last_modified=None, private=False):
+    """
+    Sets ETag and Last-Modified on a response and asks caches to revalidate it before reuse.
+    """
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    if private:
+        patch_cache_control(response, no_cache=True, private=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Returns a 304 Not Modified response, with its validators, when the If-None-Match or
+    If-Modified-Since headers of a GET request match, and None otherwise.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Answers list requests with 304 Not Modified while the page is unchanged, judged from
+    the ids and `version_field` of its rows, which are read by the page query itself, and
+    from the pagination state. An unchanged page is not serialized again, and no query
+    beyond the pagination's own is made.
+    """
+    version_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).annotate(list_version=F(self.version_field))
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+
+        modified = max((row.list_version for row in rows if row.list_version is not None), default=None)
+        etag = make_etag(
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            ','.join(f'{row.pk}@{row.list_version.isoformat() if row.list_version else ""}' for row in rows),
+            page_state(self.paginator) if page is not None else '',
+        )
+
+        response = not_modified(request, etag, modified)
+        if response is None:
+            data = self.get_serializer(rows, many=True).data
+            response = self.get_paginated_response(data) if page is not None else Response(data)
+        return set_validators(response, etag, modified)
+
+
+def page_state(paginator):
+    """
+    What a paginated response says besides its rows: the total of page number pagination,
+    or whether keyset pagination has a next page.
+    """
+    paginator = getattr(paginator, 'paginator', paginator)
+    page = getattr(paginator, 'page', None)
+    if hasattr(page, 'paginator'):
+        return page.paginator.count
+    return getattr(paginator, 'has_next', '')
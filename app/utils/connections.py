@@ -0,0 +1,48 @@
+import os
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+
+class ConnectionCounters:
+    """
+    Per-process counters of database connections opened and requests served. With
+    persistent connections, requests should far outnumber connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = {}
+        self.requests = 0
+
+    def connection_opened(self, alias):
+        with self._lock:
+            self.opened[alias] = self.opened.get(alias, 0) + 1
+
+    def request_finished(self):
+        with self._lock:
+            self.requests += 1
+
+    def as_dict(self):
+        with self._lock:
+            opened = dict(self.opened)
+            requests = self.requests
+
+        return {
+            'pid': os.getpid(),
+            'requests': requests,
+            'databases': {
+                alias: {
+                    'connections_opened': opened.get(alias, 0),
+                    'reuse_ratio': requests / opened[alias] if opened.get(alias) else None,
+                    'conn_max_age': settings.DATABASES[alias].get('CONN_MAX_AGE', 0),
+                    'health_checks': settings.DATABASES[alias].get('CONN_HEALTH_CHECKS', False),
+                    'open_in_this_thread': connections[alias].connection is not None,
+                }
+                for alias in settings.DATABASES
+            },
+        }
+
+
+counters = ConnectionCounters()
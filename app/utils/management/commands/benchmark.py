@@ -0,0 +1,172 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from analytics.statistics import rebuild_statistics
+from attempt.grading import grade_exam
+from attempt.models import Attempt
+from attempt.partitions import archive_answer_partition, is_partitioned
+from exam import snapshot
+from exam.models import Exam, ExamQuestion
+from student.models import Student
+from utils.management.commands.generate_data import Command as GenerateData
+
+
+class Command(BaseCommand):
+    """
+    Command that measures the API endpoints, exam delivery, grading and admin pages
+    in-process against the configured database, and reports p50/p99 latency and query
+    counts. Results can be saved and compared with a previous run to catch regressions.
+    Fill the database with "generate_data" first.
+
+    Submissions and grading run on a scratch copy of the exam, with attempts made by
+    generate_data, through a temporary staff user; both are deleted at the end and the
+    statistics of the exam's questions rebuilt. It still writes to the database, so it
+    only runs with DEBUG on or --allow-writes.
+
+    You can call it by terminal like this:
+    -> "python manage.py benchmark --iterations 50 --output bench.json"
+    -> "python manage.py benchmark --baseline bench.json"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--exam', type=int, help='Exam used by the scenarios, defaults to the latest one.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='Fail when results regress against this JSON file.')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p50 slowdown against the baseline.')
+        parser.add_argument('--allow-writes', action='store_true', help='Run with DEBUG off, e.g. against a staging copy.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_writes']:
+            raise CommandError('The benchmark writes to the database; run it with DEBUG on or pass --allow-writes.')
+        exam = Exam.objects.get(pk=options['exam']) if options['exam'] else Exam.objects.order_by('-pk').first()
+        if exam is None:
+            raise CommandError('There are no exams to benchmark, run "generate_data" first.')
+
+        username = f'benchmark-{uuid.uuid4().hex[:8]}'
+        admin = Student.objects.create(username=username, email=f'{username}@example.com', is_staff=True, is_superuser=True)
+        scratch = self.create_scratch_exam(exam)
+        try:
+            client = Client()
+            client.force_login(admin)
+            results = {}
+            for name, scenario in self.scenarios(client, exam, scratch).items():
+                results[name] = self.measure(scenario, options['iterations'])
+                self.report(name, results[name])
+        finally:
+            self.delete_scratch_exam(scratch)
+            admin.delete()
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def create_scratch_exam(self, exam):
+        """
+        Copy of the exam with the same questions and as many attempts, generated by
+        generate_data for the students that took it, so grading costs about the same.
+        """
+        scratch = Exam.objects.create(name=f'{exam.name} (benchmark)')
+        ExamQuestion.objects.bulk_create([
+            ExamQuestion(exam=scratch, question_id=question_id, number=number)
+            for question_id, number in ExamQuestion.objects.filter(exam=exam).values_list('question_id', 'number')
+        ])
+        student_ids = list(Attempt.objects.filter(exam=exam).values_list('student_id', flat=True))
+        generator = GenerateData(stdout=self.stdout)
+        generator.start(seed=0, batch_size=5000)
+        generator.create_attempts([scratch.pk], student_ids, len(student_ids))
+        return scratch
+
+    def delete_scratch_exam(self, scratch):
+        question_ids = list(ExamQuestion.objects.filter(exam=scratch).values_list('question_id', flat=True))
+        with transaction.atomic():
+            exam_id = scratch.pk
+            scratch.delete()
+            if is_partitioned():
+                archive_answer_partition(exam_id, drop=True)
+            rebuild_statistics(question_ids)
+
+    def scenarios(self, client, exam, scratch):
+        payload = snapshot.get_exam_payload(exam.pk)
+        sheet = {
+            'exam': scratch.pk,
+            'answers': [
+                {'number': exam_question['number'], 'option': exam_question['question']['alternatives'][0]['option']}
+                for exam_question in payload['questions']
+                if exam_question['question']['alternatives']
+            ],
+        }
+        first_question = payload['questions'][0]['question'] if payload['questions'] else None
+        search_term = first_question['content'].split()[0] if first_question else 'paciente'
+
+        def cold_delivery():
+            snapshot.invalidate_exams([exam.pk])
+            return client.get(f'/api/exams/{exam.pk}/')
+
+        return {
+            'exam list': lambda: client.get('/api/exams/'),
+            'exam list (keyset)': lambda: client.get('/api/exams/?pagination=keyset'),
+            'exam delivery (cold)': cold_delivery,
+            'exam delivery (cached)': lambda: client.get(f'/api/exams/{exam.pk}/'),
+            'exam questions (keyset)': lambda: client.get(f'/api/exams/{exam.pk}/questions/?pagination=keyset'),
+            'question bank': lambda: client.get('/api/questions/'),
+            'question search': lambda: client.get('/api/questions/', {'search': search_term}),
+            'answer submission': lambda: client.post('/api/attempts/submit/', sheet, content_type='application/json'),
+            'grading': lambda: grade_exam(scratch.pk),
+            'leaderboard': lambda: client.get(f'/api/exams/{exam.pk}/leaderboard/'),
+            'admin exam list': lambda: client.get('/admin/exam/exam/'),
+            'admin exam change': lambda: client.get(f'/admin/exam/exam/{exam.pk}/change/'),
+            'admin question change': lambda: client.get(f'/admin/question/question/{first_question["id"]}/change/'),
+        }
+
+    def measure(self, scenario, iterations):
+        latencies = []
+        queries = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = scenario()
+                latencies.append(time.perf_counter() - started)
+            queries.append(len(context.captured_queries))
+            if response is not None and getattr(response, 'status_code', 200) >= 400:
+                raise CommandError(f'Scenario failed with status {response.status_code}.')
+
+        latencies.sort()
+        return {
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            'queries': max(queries),
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f'{name:<28} p50 {result["p50_ms"]:9.2f}ms   p99 {result["p99_ms"]:9.2f}ms   {result["queries"]:5d} queries'
+        )
+
+    def compare(self, results, path, tolerance):
+        with open(path) as file:
+            baseline = json.load(file)
+
+        regressions = []
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if result['queries'] > previous['queries']:
+                regressions.append(f'{name}: {previous["queries"]} -> {result["queries"]} queries')
+            if result['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+                regressions.append(f'{name}: p50 {previous["p50_ms"]:.2f}ms -> {result["p50_ms"]:.2f}ms')
+
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
@@ -0,0 +1,67 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand
+
+DEFAULT_PATHS = ('/api/exams/1/', '/api/async/exams/1/')
+
+
+class Command(BaseCommand):
+    """
+    Command that fires concurrent requests at a running server and compares throughput and
+    latency of several paths, e.g. the sync exam delivery against its async counterpart.
+    Run it once against the WSGI server and once against uvicorn to compare serving modes.
+
+    You can call it by terminal like this:
+    -> "python manage.py benchmark_concurrency --base-url http://localhost:8000 --concurrency 200
+        --header 'Cookie: sessionid=...'"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000')
+        parser.add_argument('--path', dest='paths', action='append', help='Defaults to the sync and async exam delivery.')
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--header', dest='headers', action='append', default=[], help='"Name: value", repeatable.')
+
+    def handle(self, *args, **options):
+        headers = dict(header.split(':', 1) for header in options['headers'])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+        for path in options['paths'] or DEFAULT_PATHS:
+            url = options['base_url'].rstrip('/') + path
+            self.run(url, headers, options['concurrency'], options['requests'])
+
+    def run(self, url, headers, concurrency, total):
+        def fetch(_):
+            request = urllib.request.Request(url, headers=headers)
+            started = time.monotonic()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as error:
+                status = error.code
+            except OSError:
+                status = None
+            return status, time.monotonic() - started
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.monotonic() - started
+
+        latencies = sorted(latency for status, latency in results if status == 200)
+        errors = sum(1 for status, _ in results if status != 200)
+        if not latencies:
+            self.stderr.write(self.style.ERROR(f'{url}: every request failed.'))
+            return
+
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f'{url}: {len(latencies) / elapsed:.0f} req/s at concurrency {concurrency}, '
+            f'p50 {statistics.median(latencies) * 1000:.1f}ms, p99 {p99 * 1000:.1f}ms, {errors} errors'
+        )
@@ -0,0 +1,36 @@
+from django.core.management import BaseCommand
+
+from attempt.exports import RESULT_FIELDS, result_rows
+from exam.exports import CONTENT_FIELDS, exam_content_rows
+from utils.streaming import CONTENT_TYPES, export_lines
+
+EXPORTS = {
+    'exams': (CONTENT_FIELDS, exam_content_rows),
+    'results': (RESULT_FIELDS, result_rows),
+}
+
+
+class Command(BaseCommand):
+    """
+    Command that streams exam content or attempt results as CSV or NDJSON.
+
+    You can call it by terminal like this:
+    -> "python manage.py export_data exams --format ndjson --output exams.ndjson"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=EXPORTS)
+        parser.add_argument('--format', dest='file_format', choices=CONTENT_TYPES, default='csv')
+        parser.add_argument('--exam', type=int, help='Only export this exam.')
+        parser.add_argument('--output', help='File to write to, defaults to stdout.')
+
+    def handle(self, *args, **options):
+        fields, rows = EXPORTS[options['dataset']]
+        lines = export_lines(options['file_format'], fields, rows(options['exam']))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
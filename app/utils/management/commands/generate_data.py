@@ -0,0 +1,156 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from attempt.grading import grade_submissions
+from attempt.models import Attempt, Answer
+from attempt.partitions import create_answer_partitions
+from exam.importer import insert_questions, insert_rows
+from exam.models import Exam, ExamQuestion
+from question.utils import AlternativesChoices
+from student.models import Student
+
+WORDS = (
+    'paciente', 'sintoma', 'diagnóstico', 'tratamento', 'coração', 'pulmão', 'fígado', 'rim',
+    'cérebro', 'sangue', 'pressão', 'febre', 'dor', 'infecção', 'antibiótico', 'vacina',
+    'criança', 'idoso', 'gestante', 'exame', 'cirurgia', 'fratura', 'diabetes', 'hipertensão',
+    'anemia', 'asma', 'pneumonia', 'insulina', 'glicose', 'músculo', 'osso', 'pele',
+)
+
+
+class Command(BaseCommand):
+    """
+    Command that fills the database with a reproducible synthetic data set: students, a
+    question bank, exams drawn from it and, optionally, graded attempts. The same seed
+    always produces the same content.
+
+    You can call it by terminal like this:
+    -> "python manage.py generate_data --students 100000 --questions 1000000 --exams 1000
+        --exam-size 120 --attempts-per-exam 500 --grade"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--questions', type=int, default=10000)
+        parser.add_argument('--exams', type=int, default=50)
+        parser.add_argument('--exam-size', type=int, default=120)
+        parser.add_argument('--attempts-per-exam', type=int, default=0)
+        parser.add_argument('--grade', action='store_true', help='Grade the generated attempts.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.start(options['seed'], options['batch_size'])
+
+        student_ids = self.create_students(options['students'], options['seed'])
+        question_ids = self.create_questions(options['questions'])
+        exam_ids = self.create_exams(options['exams'], min(options['exam_size'], len(question_ids)), question_ids)
+        if options['attempts_per_exam']:
+            self.create_attempts(exam_ids, student_ids, options['attempts_per_exam'])
+            if options['grade']:
+                for exam_id in exam_ids:
+                    grade_submissions(exam_id)
+                self.progress(f'Graded {len(exam_ids)} exams')
+
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.monotonic() - self.started:.1f}s.'))
+
+    def start(self, seed, batch_size):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.started = time.monotonic()
+
+    def progress(self, message):
+        self.stdout.write(f'[{time.monotonic() - self.started:.1f}s] {message}')
+
+    def sentence(self, size):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(size))
+
+    def create_students(self, count, seed):
+        # Hashing once keeps the generator fast; every student gets the password "benchmark".
+        password = make_password('benchmark')
+        student_ids = []
+        for start in range(0, count, self.batch_size):
+            students = [
+                Student(
+                    username=f'synthetic-{seed}-{index}',
+                    email=f'synthetic-{seed}-{index}@example.com',
+                    name=self.sentence(2).title(),
+                    password=password,
+                )
+                for index in range(start, min(start + self.batch_size, count))
+            ]
+            student_ids += [student.pk for student in Student.objects.bulk_create(students)]
+            self.progress(f'{len(student_ids)} students')
+        return student_ids
+
+    def create_questions(self, count):
+        question_ids = []
+        for start in range(0, count, self.batch_size):
+            questions_data = []
+            for _ in range(min(self.batch_size, count - start)):
+                options = list(AlternativesChoices)[:self.rng.choice((4, 5))]
+                correct = self.rng.choice(options)
+                questions_data.append({
+                    'content': self.sentence(self.rng.randint(8, 30)).capitalize() + '?',
+                    'alternatives': [
+                        {'alternative': option.value, 'content': self.sentence(self.rng.randint(1, 6)), 'is_correct': option == correct}
+                        for option in options
+                    ],
+                })
+            with transaction.atomic():
+                question_ids += insert_questions(questions_data, self.batch_size)[0]
+            self.progress(f'{len(question_ids)} questions')
+        return question_ids
+
+    def create_exams(self, count, size, question_ids):
+        exam_ids = []
+        chunk = max(1, self.batch_size // max(size, 1))
+        for start in range(0, count, chunk):
+            with transaction.atomic():
+                exams = Exam.objects.bulk_create([
+                    Exam(name=f'Simulado {index + 1}') for index in range(start, min(start + chunk, count))
+                ])
+                create_answer_partitions([exam.pk for exam in exams])
+                insert_rows(ExamQuestion, ['exam', 'question', 'number'], [
+                    (exam.pk, question_id, number)
+                    for exam in exams
+                    for number, question_id in enumerate(self.rng.sample(question_ids, size), start=1)
+                ], batch_size=self.batch_size)
+            exam_ids += [exam.pk for exam in exams]
+            self.progress(f'{len(exam_ids)} exams')
+        return exam_ids
+
+    def create_attempts(self, exam_ids, student_ids, per_exam):
+        abilities = {student_id: self.rng.random() for student_id in student_ids}
+        total = 0
+        for exam_id in exam_ids:
+            alternatives = {}
+            for exam_question_id, alternative_id, is_correct in (
+                ExamQuestion.objects
+                .filter(exam_id=exam_id)
+                .order_by('number', 'question__alternatives__option')
+                .values_list('id', 'question__alternatives__id', 'question__alternatives__is_correct')
+            ):
+                right, wrong = alternatives.setdefault(exam_question_id, ([], []))
+                (right if is_correct else wrong).append(alternative_id)
+
+            with transaction.atomic():
+                attempts = Attempt.objects.bulk_create([
+                    Attempt(student_id=student_id, exam_id=exam_id, submitted_at=timezone.now())
+                    for student_id in self.rng.sample(student_ids, min(per_exam, len(student_ids)))
+                ])
+                rows = []
+                for attempt in attempts:
+                    chance = 0.3 + 0.6 * abilities[attempt.student_id]
+                    for exam_question_id, (right, wrong) in alternatives.items():
+                        if self.rng.random() < 0.05:
+                            continue
+                        pool = right if self.rng.random() < chance or not wrong else wrong
+                        rows.append((attempt.pk, exam_id, exam_question_id, self.rng.choice(pool)))
+                insert_rows(Answer, ['attempt', 'exam', 'exam_question', 'alternative'], rows, batch_size=self.batch_size)
+            total += len(attempts)
+            self.progress(f'{total} attempts')
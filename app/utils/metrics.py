@@ -0,0 +1,102 @@
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics keyed by (URL pattern, method), rendered in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, method, latency, queries, query_seconds, response_bytes):
+        with self._lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[(route, method)] = RouteMetrics()
+            metrics.latency.observe(latency)
+            if queries is not None:
+                metrics.queries.observe(queries)
+                metrics.query_seconds += query_seconds
+            metrics.response_bytes += response_bytes or 0
+
+    def render(self, sample_rate):
+        lines = [
+            '# HELP medway_metrics_sample_rate Share of requests that are measured.',
+            '# TYPE medway_metrics_sample_rate gauge',
+            f'medway_metrics_sample_rate {sample_rate}',
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines += self.render_histogram(
+                'medway_request_duration_seconds', 'Request latency.', routes, lambda metrics: metrics.latency,
+            )
+            lines += self.render_histogram(
+                'medway_request_queries', 'SQL queries per request.', routes, lambda metrics: metrics.queries,
+            )
+            lines += [
+                '# HELP medway_request_query_seconds_total Time spent in SQL queries.',
+                '# TYPE medway_request_query_seconds_total counter',
+            ]
+            lines += [
+                f'medway_request_query_seconds_total{{{labels(route, method)}}} {metrics.query_seconds}'
+                for (route, method), metrics in routes
+            ]
+            lines += [
+                '# HELP medway_response_bytes_total Size of response bodies.',
+                '# TYPE medway_response_bytes_total counter',
+            ]
+            lines += [
+                f'medway_response_bytes_total{{{labels(route, method)}}} {metrics.response_bytes}'
+                for (route, method), metrics in routes
+            ]
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def render_histogram(name, description, routes, histogram_of):
+        lines = [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+        for (route, method), metrics in routes:
+            histogram = histogram_of(metrics)
+            route_labels = labels(route, method)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{route_labels},le="{bound}"}} {cumulative}')
+            cumulative += histogram.counts[-1]
+            lines.append(f'{name}_bucket{{{route_labels},le="+Inf"}} {cumulative}')
+            lines.append(f'{name}_sum{{{route_labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{route_labels}}} {cumulative}')
+        return lines
+
+
+def labels(route, method):
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'route="{route}",method="{method}"'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from rest_framework import status
+
+from utils.admission import AsyncConcurrencyLimiter, ConcurrencyLimiter
+from utils.metrics import registry
+from utils.routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match else 'unmatched'
+
+
+def response_size(response):
+    if getattr(response, 'streaming', False):
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count and time, and response size per URL pattern for a
+    sample of the requests (METRICS_SAMPLE_RATE), and logs requests issuing more than
+    METRICS_QUERY_THRESHOLD queries. Queries are only counted for sync views: async views
+    run their queries on connections of other threads.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        self.query_threshold = getattr(settings, 'METRICS_QUERY_THRESHOLD', 50)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, counter)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, None)
+        return response
+
+    def record(self, request, response, latency, counter):
+        route = route_of(request)
+        queries = counter.count if counter else None
+        registry.record(
+            route, request.method, latency, queries, counter.seconds if counter else 0.0, response_size(response),
+        )
+        if queries is not None and queries > self.query_threshold:
+            logger.warning('%s %s issued %d queries in %.3fs.', request.method, route, queries, counter.seconds)
+
+
+class AdmissionControlMiddleware:
+    """
+    Bounds the requests under REST_FRAMEWORK["ADMISSION_CONTROL"]["PATH_PREFIXES"] running
+    at once in this process, with a short queue in front (see utils/admission.py). Requests
+    that do not get a slot are answered with 429 and Retry-After before reaching the views
+    and the database.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.REST_FRAMEWORK.get('ADMISSION_CONTROL', {})
+        self.prefixes = tuple(config.get('PATH_PREFIXES', ('/api/',)))
+        limit = config.get('MAX_CONCURRENT_REQUESTS', 0)
+        timeout = config.get('QUEUE_TIMEOUT', 1.0)
+        self.retry_after = str(math.ceil(timeout) or 1)
+
+        limiter_class = ConcurrencyLimiter
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            limiter_class = AsyncConcurrencyLimiter
+        self.limiter = limiter_class(limit, config.get('QUEUE_SIZE', 0), timeout) if limit else None
+
+    def admits(self, request):
+        return self.limiter is None or not request.path.startswith(self.prefixes)
+
+    def rejected(self):
+        return JsonResponse(
+            {'detail': 'Server busy, try again later.'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': self.retry_after},
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.admits(request):
+            return self.get_response(request)
+
+        if not self.limiter.acquire():
+            return self.rejected()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        if response.streaming:
+            # A streamed response keeps working while it is sent, until the server closes it.
+            response._resource_closers.append(self.limiter.release)
+        else:
+            self.limiter.release()
+        return response
+
+    async def __acall__(self, request):
+        if self.admits(request):
+            return await self.get_response(request)
+
+        if not await self.limiter.acquire():
+            return self.rejected()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await self.limiter.release()
+            raise
+        if response.streaming:
+            response._resource_closers.append(self.limiter.release_soon(asyncio.get_running_loop()))
+        else:
+            await self.limiter.release()
+        return response
+
+
+class PrimaryPinningMiddleware:
+    """
+    Reads of requests that write (unsafe methods) and of the admin go to the primary, so
+    they see their own writes instead of a lagging replica.
+    """
+    async_capable = True
+    sync_capable = True
+    primary_paths = ('/admin/',)
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def pinned(self, request):
+        return request.method not in ('GET', 'HEAD', 'OPTIONS') or request.path.startswith(self.primary_paths)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.pinned(request):
+            return self.get_response(request)
+        with use_primary():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not self.pinned(request):
+            return await self.get_response(request)
+        with use_primary():
+            return await self.get_response(request)
@@ -0,0 +1,123 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as FieldValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates by seeking past the key of the last row served instead of using OFFSET,
+    and never counts the queryset, so every page costs the same.
+
+    The key is taken from the view's `keyset_ordering`, which must be unique and
+    backed by an index, e.g. ('id',) or ('exam', 'number'). Pages are always ordered by
+    that key, replacing any ordering of the queryset.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    default_ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = getattr(view, 'keyset_ordering', self.default_ordering)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode_cursor(cursor, queryset.model)))
+
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def after(self, key):
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            step = Q(**{f'{field}__gt': key[index]})
+            for previous_field, previous_value in zip(self.ordering[:index], key[:index]):
+                step &= Q(**{previous_field: previous_value})
+            condition |= step
+        return condition
+
+    def encode_cursor(self, row):
+        key = [getattr(row, row._meta.get_field(field).attname) for field in self.ordering]
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def decode_cursor(self, cursor, model):
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid cursor.')
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound('Invalid cursor.')
+        try:
+            key = [model._meta.get_field(field).to_python(value) for field, value in zip(self.ordering, key)]
+        except (TypeError, FieldValidationError):
+            raise NotFound('Invalid cursor.')
+        if None in key:
+            raise NotFound('Invalid cursor.')
+        return key
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class SelectablePagination(BasePagination):
+    """
+    Lets clients choose the pagination of an endpoint with ?pagination=page|keyset.
+    A request carrying a keyset cursor always uses keyset pagination. Query parameters
+    that order the results some other way, listed in the view's `keyset_excluded_params`,
+    can only be used with page pagination.
+    """
+    pagination_query_param = 'pagination'
+    default_mode = 'page'
+    modes = {
+        'page': PageNumberPagination,
+        'keyset': KeysetPagination,
+    }
+
+    def select(self, request, view):
+        if request.query_params.get(KeysetPagination.cursor_query_param):
+            mode = 'keyset'
+        else:
+            mode = request.query_params.get(self.pagination_query_param, getattr(view, 'default_pagination', self.default_mode))
+        if mode not in self.modes:
+            raise NotFound(f'Unknown pagination mode: {mode}.')
+        if mode == 'keyset':
+            for param in getattr(view, 'keyset_excluded_params', ()):
+                if request.query_params.get(param):
+                    raise ValidationError({param: 'Not supported with keyset pagination.'})
+        return self.modes[mode]()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.select(request, view)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return {'oneOf': [paginator().get_paginated_response_schema(schema) for paginator in self.modes.values()]}
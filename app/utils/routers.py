@@ -0,0 +1,57 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+primary_pinned = ContextVar('primary_pinned', default=False)
+
+
+@contextmanager
+def use_primary():
+    """
+    Sends every read inside the block to the primary, for code that must see its own
+    (or very recent) writes.
+    """
+    token = primary_pinned.set(True)
+    try:
+        yield
+    finally:
+        primary_pinned.reset(token)
+
+
+def replica_alias():
+    """
+    Database for reporting queries that tolerate replication lag.
+    """
+    if not settings.DATABASE_REPLICAS or primary_pinned.get():
+        return DEFAULT_DB_ALIAS
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """
+    Sends reads of the models in REPLICA_READ_MODELS ("app_label" or "app_label.model")
+    to a random replica of DATABASE_REPLICAS, unless the primary is pinned or a
+    transaction is open on it. Every other read and all writes go to the primary, and
+    only the primary is migrated: replicas are copies of it.
+    """
+
+    def routed(self, model):
+        opts = model._meta
+        return opts.app_label in settings.REPLICA_READ_MODELS or opts.label_lower in settings.REPLICA_READ_MODELS
+
+    def db_for_read(self, model, **hints):
+        if not self.routed(model) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,15 @@
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from utils.connections import counters
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    counters.connection_opened(connection.alias)
+
+
+@receiver(request_finished)
+def count_request(sender, **kwargs):
+    counters.request_finished()
@@ -0,0 +1,61 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def export_lines(file_format, fields, rows):
+    if file_format == 'csv':
+        return csv_lines(fields, rows)
+    if file_format == 'ndjson':
+        return ndjson_lines(fields, rows)
+    raise ValueError(f'Unknown export format: {file_format}')
+
+
+def id_param(request, name):
+    """Reads an optional integer filter from the query string, rejecting anything else with a 400."""
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'A valid integer is required.'})
+
+
+def streaming_export(file_format, fields, rows, filename):
+    """
+    Streams rows as CSV or NDJSON without building the whole body in memory. The rows
+    should come from QuerySet.iterator() so the database side is streamed as well.
+    """
+    if file_format not in CONTENT_TYPES:
+        raise Http404
+    response = StreamingHttpResponse(export_lines(file_format, fields, rows), content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
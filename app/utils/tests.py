@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import time
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db import connections, router, transaction
+from django.test.utils import CaptureQueriesContext
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from analytics.models import QuestionStatistics
+from attempt.models import Answer, Attempt
+from exam.models import Exam, ExamQuestion
+from jobs.models import Job
+from question.models import Alternative, Question
+from student.models import Student
+from utils import throttling
+from utils.admission import AsyncConcurrencyLimiter, ConcurrencyLimiter
+from utils.middleware import AdmissionControlMiddleware
+from utils.routers import use_primary
+from utils.throttling import LocalBucketStore
+
+
+def rest_framework(**changes):
+    return {**settings.REST_FRAMEWORK, **changes}
+
+
+def throttle_rates(**rates):
+    return rest_framework(DEFAULT_THROTTLE_RATES={**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates})
+
+
+def admission_control(limit, queue_size, timeout):
+    return rest_framework(ADMISSION_CONTROL={
+        'MAX_CONCURRENT_REQUESTS': limit, 'QUEUE_SIZE': queue_size, 'QUEUE_TIMEOUT': timeout, 'PATH_PREFIXES': ('/api/',),
+    })
+
+
+
+
+class MetricsAccessTests(TestCase):
+    url = '/metrics/'
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.5'], METRICS_TOKEN=None)
+    def test_scrapes_are_limited_to_the_allowed_ips(self):
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.5').status_code, 200)
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.6').status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN='segredo')
+    def test_scrapes_with_the_token_are_accepted(self):
+        self.assertEqual(self.client.get(self.url, headers={'Authorization': 'Bearer segredo'}).status_code, 200)
+        self.assertEqual(self.client.get(self.url, headers={'Authorization': 'Bearer outro'}).status_code, 403)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class BucketStoreTests(SimpleTestCase):
+    def test_bucket_refills_evenly(self):
+        store = LocalBucketStore()
+        with mock.patch('utils.throttling.time.monotonic', return_value=100.0):
+            self.assertEqual(store.consume('key', 2, 2 / 60), 0)
+            self.assertEqual(store.consume('key', 2, 2 / 60), 0)
+            self.assertAlmostEqual(store.consume('key', 2, 2 / 60), 30)
+        with mock.patch('utils.throttling.time.monotonic', return_value=130.0):
+            self.assertEqual(store.consume('key', 2, 2 / 60), 0)
+            self.assertAlmostEqual(store.consume('key', 2, 2 / 60), 30)
+
+
+@override_settings(REST_FRAMEWORK=throttle_rates(**{'exam-delivery': '1/min', 'student': '100/min'}))
+class ThrottleTests(TestCase):
+    def setUp(self):
+        throttling.store = None
+        self.exam = Exam.objects.create(name='Pediatria')
+        self.student = Student.objects.create(username='aluno', email='aluno@medway.com')
+        self.client.force_login(self.student)
+
+    def test_exhausted_bucket_answers_429_with_retry_after(self):
+        self.assertEqual(self.client.get(f'/api/exams/{self.exam.pk}/').status_code, 200)
+        response = self.client.get(f'/api/exams/{self.exam.pk}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        # The async view draws from the same bucket.
+        response = self.client.get(f'/api/async/exams/{self.exam.pk}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_scopes_have_their_own_buckets(self):
+        self.client.get(f'/api/exams/{self.exam.pk}/')
+        self.assertEqual(self.client.get(f'/api/exams/{self.exam.pk}/').status_code, 429)
+        self.assertEqual(self.client.get('/api/exams/').status_code, 200)
+
+    def test_staff_is_not_throttled(self):
+        self.client.force_login(Student.objects.create(username='admin', email='admin@medway.com', is_staff=True))
+        for _ in range(3):
+            self.assertEqual(self.client.get(f'/api/exams/{self.exam.pk}/').status_code, 200)
+            self.assertEqual(self.client.get(f'/api/async/exams/{self.exam.pk}/').status_code, 200)
+
+
+class ConcurrencyLimiterTests(SimpleTestCase):
+    def acquire_in_thread(self, limiter):
+        results = []
+        thread = threading.Thread(target=lambda: results.append(limiter.acquire()))
+        thread.start()
+        while not limiter.waiting and thread.is_alive():
+            time.sleep(0.001)
+        return thread, results
+
+    def test_queued_request_times_out_and_full_queue_is_refused(self):
+        limiter = ConcurrencyLimiter(1, 1, 0.1)
+        self.assertTrue(limiter.acquire())
+        thread, results = self.acquire_in_thread(limiter)
+        self.assertFalse(limiter.acquire())
+        thread.join()
+        self.assertEqual(results, [False])
+
+    def test_queued_request_gets_a_released_slot(self):
+        limiter = ConcurrencyLimiter(1, 1, 5)
+        limiter.acquire()
+        thread, results = self.acquire_in_thread(limiter)
+        limiter.release()
+        thread.join()
+        self.assertEqual(results, [True])
+
+    def test_async_queued_request_times_out_or_gets_a_released_slot(self):
+        async def scenario():
+            limiter = AsyncConcurrencyLimiter(1, 1, 0.1)
+            self.assertTrue(await limiter.acquire())
+            self.assertFalse(await limiter.acquire())
+
+            limiter.timeout = 5
+            waiting = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0.01)
+            self.assertFalse(await limiter.acquire())
+            await limiter.release()
+            self.assertTrue(await waiting)
+
+        asyncio.run(scenario())
+
+
+class AdmissionControlMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/api/exams/')
+
+    @override_settings(REST_FRAMEWORK=admission_control(1, 0, 0.1))
+    def test_streamed_response_holds_its_slot_until_closed(self):
+        middleware = AdmissionControlMiddleware(lambda request: StreamingHttpResponse(iter([b'linha'])))
+        response = middleware(self.request)
+
+        rejected = middleware(self.request)
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected['Retry-After'], '1')
+        response.close()
+        self.assertEqual(middleware(self.request).status_code, 200)
+
+    @override_settings(REST_FRAMEWORK=admission_control(1, 0, 0.1))
+    def test_plain_response_releases_its_slot_when_returned(self):
+        middleware = AdmissionControlMiddleware(lambda request: HttpResponse())
+        self.assertEqual(middleware(self.request).status_code, 200)
+        self.assertEqual(middleware(self.request).status_code, 200)
+
+    @override_settings(REST_FRAMEWORK=admission_control(1, 0, 0.1))
+    def test_async_streamed_response_holds_its_slot_until_closed(self):
+        async def get_response(request):
+            return StreamingHttpResponse(iter([b'linha']))
+
+        async def scenario():
+            middleware = AdmissionControlMiddleware(get_response)
+            response = await middleware(self.request)
+            self.assertEqual((await middleware(self.request)).status_code, 429)
+            # Django closes responses from a worker thread under ASGI.
+            await asyncio.to_thread(response.close)
+            await asyncio.sleep(0.01)
+            self.assertEqual((await middleware(self.request)).status_code, 200)
+
+        asyncio.run(scenario())
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRouterTests(TransactionTestCase):
+    databases = '__all__'
+    catalog = (Exam, ExamQuestion, Question, Alternative, QuestionStatistics)
+
+    def test_catalog_reads_go_to_the_replica(self):
+        for model in self.catalog:
+            self.assertEqual(model.objects.all().db, 'replica_1', model)
+
+    def test_writes_go_to_the_primary(self):
+        for model in self.catalog:
+            self.assertEqual(router.db_for_write(model), 'default', model)
+        self.assertEqual(Exam.objects.create(name='Pediatria')._state.db, 'default')
+
+    def test_pinned_primary_and_open_transactions_read_from_the_primary(self):
+        with use_primary():
+            self.assertEqual(Exam.objects.all().db, 'default')
+        with transaction.atomic():
+            self.assertEqual(Question.objects.all().db, 'default')
+        self.assertEqual(Exam.objects.all().db, 'replica_1')
+
+    @skipUnless('replica_1' in settings.DATABASES, 'Needs DATABASE_REPLICAS, e.g. DATABASE_REPLICAS=replica.sqlite3.')
+    def test_catalog_queries_run_on_the_replica(self):
+        exam = Exam.objects.create(name='Pediatria')
+        with CaptureQueriesContext(connections['replica_1']) as replica, CaptureQueriesContext(connections['default']) as primary:
+            self.assertEqual(Exam.objects.get(pk=exam.pk).name, 'Pediatria')
+            Attempt.objects.filter(exam=exam).exists()
+        self.assertEqual(len(replica), 1)
+        self.assertEqual(len(primary), 1)
+
+    def test_attempts_students_and_jobs_never_leave_the_primary(self):
+        for model in (Attempt, Answer, Student, Job):
+            self.assertEqual(model.objects.all().db, 'default', model)
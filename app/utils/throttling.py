@@ -0,0 +1,158 @@
+"""
+Token-bucket throttles for DRF.
+
+A rate of "10/min" is a bucket of 10 requests refilled evenly over a minute, so a client
+can burst up to the rate and is then smoothed to it. Buckets live in the store named by
+REST_FRAMEWORK["THROTTLE_BACKEND"]: LocalBucketStore keeps them in the process, while
+CacheBucketStore shares them through a Django cache (read-modify-write, so concurrent
+requests of the same client may occasionally both pass).
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """
+    "10/min" -> (10, 60), in the format of DRF's DEFAULT_THROTTLE_RATES.
+    """
+    num_requests, period = rate.split('/')
+    return int(num_requests), PERIODS[period[0]]
+
+
+def take(tokens, updated, now, capacity, refill_rate):
+    """
+    Refills a bucket up to now and takes one token from it. Returns the tokens left and
+    0, or the untouched tokens and the seconds until one is available.
+    """
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated, _ = self.buckets.get(key, (capacity, now, now))
+            tokens, wait = take(tokens, updated, now, capacity, refill_rate)
+            if key not in self.buckets and len(self.buckets) >= self.max_entries:
+                self.prune(now)
+            self.buckets[key] = (tokens, now, now + (capacity - tokens) / refill_rate)
+        return wait
+
+    def prune(self, now):
+        # Buckets that are full again are the same as missing ones.
+        self.buckets = {key: bucket for key, bucket in self.buckets.items() if bucket[2] > now}
+        if len(self.buckets) >= self.max_entries:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+
+    def __init__(self):
+        self.cache = caches[settings.REST_FRAMEWORK.get('THROTTLE_CACHE_ALIAS', 'default')]
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        tokens, updated = self.cache.get(key, (capacity, now))
+        tokens, wait = take(tokens, updated, now, capacity, refill_rate)
+        self.cache.set(key, (tokens, now), math.ceil((capacity - tokens) / refill_rate) or 1)
+        return wait
+
+
+store = None
+
+
+def get_store():
+    global store
+    if store is None:
+        backend = settings.REST_FRAMEWORK.get('THROTTLE_BACKEND', 'utils.throttling.LocalBucketStore')
+        store = import_string(backend)()
+    return store
+
+
+def bucket_wait(scope, ident):
+    """
+    Consumes a request of the given client from the bucket of a scope configured in
+    DEFAULT_THROTTLE_RATES. Returns the seconds to wait, 0 when the request may go on.
+    """
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if rate is None:
+        return 0
+    num_requests, duration = parse_rate(rate)
+    return get_store().consume(f'throttle_{scope}_{ident}', num_requests, num_requests / duration)
+
+
+def throttled_response(wait):
+    """
+    429 response for the plain async views, matching the one DRF sends for Throttled.
+    """
+    return JsonResponse(
+        {'detail': 'Request was throttled.'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': str(math.ceil(wait))},
+    )
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles each student, or each address when anonymous, with a token bucket.
+    Staff users are not throttled.
+    """
+    scope = None
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_cache_key(self, request, view):
+        if request.user.is_staff:
+            return None
+        if request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        self.wait_seconds = 0
+        ident = self.get_cache_key(request, view) if self.scope else None
+        if ident is None:
+            return True
+        self.wait_seconds = bucket_wait(self.scope, ident)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class StudentRateThrottle(TokenBucketThrottle):
+    """
+    Bucket shared by every endpoint, rate "student".
+    """
+    scope = 'student'
+
+
+class ScopedBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per endpoint, with the rate of the "throttle_scope" of the view.
+    """
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scope', None)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from utils.views import ConnectionStatsView
+
+urlpatterns = [
+    path('stats/connections/', ConnectionStatsView.as_view(), name='connection-stats'),
+]
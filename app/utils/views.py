@@ -0,0 +1,49 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from student.authentication import bearer_token
+
+from utils.connections import counters
+from utils.metrics import registry
+
+
+class ConnectionStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(counters.as_dict())
+
+
+def can_scrape(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        try:
+            given = bearer_token(request)
+        except AuthenticationFailed:
+            given = None
+        if given is not None and hmac.compare_digest(given.encode(), token.encode()):
+            return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint, open to METRICS_ALLOWED_IPS and METRICS_TOKEN only.
+    The metrics are those of the process serving the scrape, so with several gunicorn
+    workers each scrape sees one of them; complete counters need one worker per scraped
+    container (WEB_WORKERS=1).
+    """
+    if not can_scrape(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
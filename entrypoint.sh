@@ -2,4 +2,29 @@
 
 python manage.py wait_for_postgres
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
+
+# SERVER_MODE picks how the project is served:
+# - dev: the single-threaded development server (default outside production);
+# - wsgi: gunicorn with WEB_WORKERS processes of WEB_THREADS threads (default in production);
+# - asgi: gunicorn managing WEB_WORKERS uvicorn workers, for the async views under /api/async/;
+# - worker: JOB_WORKERS background job workers (python manage.py run_jobs).
+if [ "$DJANGO_ENV" = "production" ]; then
+    SERVER_MODE="${SERVER_MODE:-wsgi}"
+fi
+
+case "$SERVER_MODE" in
+    wsgi)
+        exec gunicorn medway_api.wsgi:application --bind 0.0.0.0:8000 \
+            --workers "${WEB_WORKERS:-4}" --threads "${WEB_THREADS:-4}" --worker-class gthread
+        ;;
+    asgi)
+        exec gunicorn medway_api.asgi:application --bind 0.0.0.0:8000 \
+            --workers "${WEB_WORKERS:-4}" --worker-class uvicorn.workers.UvicornWorker
+        ;;
+    worker)
+        exec python manage.py run_jobs --workers "${JOB_WORKERS:-2}"
+        ;;
+    *)
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+esac